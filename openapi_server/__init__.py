@@ -70,4 +70,9 @@ def main():
         pythonic_params=True,
         pass_context_arg_name="request",
     )
+    from openapi_server.controllers import default_controller, http_client
+
+    app.app.on_startup.append(default_controller.start_build_poller)
+    app.app.on_cleanup.append(default_controller.stop_build_poller)
+    app.app.on_cleanup.append(http_client.close_session)
     app.run(port=options_cli.port)
@@ -4,7 +4,9 @@
 # SPDX-License-Identifier: GPL-3.0-only
 
 import logging
+import sys
 
+from github import Auth
 from openapi_server import config
 from openapi_server.controllers.badgr import BadgrUtils
 from openapi_server.controllers.git import GitUtils
@@ -15,6 +17,11 @@ SUPPORTED_PLATFORMS = {"github": "https://github.com"}
 REPOSITORY_BACKEND = config.get("repository_backend")
 TOKEN_GH_FILE = config.get_repo("token", fallback="/etc/sqaaas/.gh_token")
 GITHUB_ORG = config.get_repo("organization")
+GITHUB_APP_ID = config.get_repo("app_id", fallback=None)
+GITHUB_APP_KEY_FILE = config.get_repo(
+    "app_private_key", fallback="/etc/sqaaas/.gh_app_key"
+)
+GITHUB_APP_INSTALLATION_ID = config.get_repo("app_installation_id", fallback=None)
 
 TOKEN_JK_FILE = config.get_ci("token", fallback="/etc/sqaaas/.jk_token")
 JENKINS_URL = config.get_ci("url")
@@ -31,11 +38,34 @@ logger = logging.getLogger("sqaaas.api.controller")
 
 def init_utils():
     # Instance of code repo backend object
-    with open(TOKEN_GH_FILE, "r") as f:
-        token = f.read().strip()
-    logger.debug("Loading GitHub token from local filesystem")
-    gh_utils = GitHubUtils(token)
-    git_utils = GitUtils(token)
+    if GITHUB_APP_ID:
+        if not str(GITHUB_APP_INSTALLATION_ID or "").strip().isdigit():
+            logger.error(
+                "GitHub App authentication (<app_id> property) requires the "
+                "numeric ID of the App's installation (<app_installation_id> "
+                "property): %s" % GITHUB_APP_INSTALLATION_ID
+            )
+            sys.exit(1)
+        with open(GITHUB_APP_KEY_FILE, "r") as f:
+            app_private_key = f.read()
+        logger.debug("Loading GitHub App's private key from local filesystem")
+        app_auth = Auth.AppAuth(GITHUB_APP_ID, app_private_key)
+        # Installation tokens are minted (and refreshed before expiring) on demand
+        installation_auth = app_auth.get_installation_auth(
+            int(GITHUB_APP_INSTALLATION_ID)
+        )
+        gh_utils = GitHubUtils(installation_auth)
+    else:
+        # One token per line: multiple tokens are used as a pool
+        with open(TOKEN_GH_FILE, "r") as f:
+            token_list = [line.strip() for line in f if line.strip()]
+        logger.debug(
+            "Loading GitHub token/s from local filesystem (found: %s)"
+            % len(token_list)
+        )
+        gh_utils = GitHubUtils(token_list)
+    # Git operations use the token (from the pool) with the highest remaining quota
+    git_utils = GitUtils(gh_utils.get_access_token)
 
     # Instance of CI system object
     with open(TOKEN_JK_FILE, "r") as f:
@@ -9,7 +9,7 @@ import logging
 import time
 from urllib.parse import urljoin
 
-import requests
+from openapi_server.controllers import http_client
 
 
 class BadgrUtils(object):
@@ -29,20 +29,12 @@ class BadgrUtils(object):
         self.issuer_name = issuer_name
         self.access_user = access_user
         self.access_pass = access_pass
+        # Token is obtained on first use (see refresh_token decorator)
+        self.access_token = None
+        self.refresh_token = None
+        self.access_token_expiration = 0
 
-        try:
-            access_token, refresh_token, expiry = self.get_token()
-            if not access_token:
-                raise Exception("Could not get access token from Badgr API!")
-        except Exception as e:
-            self.logger.debug(e)
-        else:
-            self.access_token = access_token
-            self.refresh_token = refresh_token
-            # Give a small buffer of 100 seconds
-            self.access_token_expiration = time.time() + expiry - 100
-
-    def get_token(self, refresh=False):
+    async def get_token(self, refresh=False):
         """Obtains a Bearer-type token according to the provided credentials.
 
         Return a (access_token, refresh_token, expires_in) tuple.
@@ -63,10 +55,11 @@ class BadgrUtils(object):
             self.logger.debug("Getting user token from Badgr API: 'POST %s'" % path)
             data = {"username": self.access_user, "password": self.access_pass}
         try:
-            r = requests.post(urljoin(self.endpoint, path), data=data)
-            self.logger.debug("'POST %s' response content: %s" % (path, r.__dict__))
-            r.raise_for_status()
-            r_json = r.json()
+            session = http_client.get_session()
+            async with session.post(urljoin(self.endpoint, path), data=data) as r:
+                self.logger.debug("'POST %s' response status: %s" % (path, r.status))
+                r.raise_for_status()
+                r_json = await r.json()
             return (
                 r_json["access_token"],
                 r_json["refresh_token"],
@@ -80,51 +73,59 @@ class BadgrUtils(object):
         """Decorator to handle the expiration of the Badgr API token."""
 
         @functools.wraps(f)
-        def decorated_function(cls, *args, **kwargs):
+        async def decorated_function(cls, *args, **kwargs):
             if time.time() > cls.access_token_expiration:
                 cls.logger.debug("Reached token expiration date")
-                access_token, refresh_token, expiry = cls.get_token()
+                token_data = await cls.get_token()
+                if not token_data:
+                    raise Exception("Could not get access token from Badgr API!")
+                access_token, refresh_token, expiry = token_data
                 cls.access_token = access_token
                 cls.refresh_token = refresh_token
                 # Give a small buffer of 100 seconds
                 cls.access_token_expiration = time.time() + expiry - 100
-            return f(cls, *args, **kwargs)
+            return await f(cls, *args, **kwargs)
 
         return decorated_function
 
+    async def _get(self, path):
+        """Performs a GET request to Badgr API.
+
+        Returns the <result> from the JSON response payload (None if unsuccessful).
+
+        :param path: Path of the request (relative to Badgr endpoint)
+        """
+        headers = {"Authorization": "Bearer %s" % self.access_token}
+        session = http_client.get_session()
+        async with session.get(urljoin(self.endpoint, path), headers=headers) as r:
+            self.logger.debug("'GET %s' response status: %s" % (path, r.status))
+            if r.ok:
+                r_json = await r.json()
+                return r_json["result"]
+
     @refresh_token
-    def get_issuers(self):
+    async def get_issuers(self):
         """Gets all the Issuers associated with the current user."""
         path = "v2/issuers"
-        headers = {"Authorization": "Bearer %s" % self.access_token}
         self.logger.debug("Getting issuers from Badgr API: 'GET %s'" % path)
-        r = requests.get(urljoin(self.endpoint, path), headers=headers)
-        self.logger.debug("'GET %s' response content: %s" % (path, r.__dict__))
-        if r.ok:
-            r_json = r.json()
-            return r_json["result"]
+        return await self._get(path)
 
     @refresh_token
-    def get_badgeclasses(self, issuer_id):
+    async def get_badgeclasses(self, issuer_id):
         """Gets all the BadgeClasses associated with the given Issuer.
 
         :param issuer_id: issuer entityID to where this BadgeClass belongs.
         """
         path = "v2/issuers/%s/badgeclasses" % issuer_id
-        headers = {"Authorization": "Bearer %s" % self.access_token}
         self.logger.debug(
             (
                 "Getting BadgeClasses for Issuer <%s> from Badgr API: "
                 "'GET %s'" % (issuer_id, path)
             )
         )
-        r = requests.get(urljoin(self.endpoint, path), headers=headers)
-        self.logger.debug("'GET %s' response content: %s" % (path, r.__dict__))
-        if r.ok:
-            r_json = r.json()
-            return r_json["result"]
+        return await self._get(path)
 
-    def _get_matching_entity_id(self, entity_name, entity_type, **kwargs):
+    async def _get_matching_entity_id(self, entity_name, entity_type, **kwargs):
         """Get the ID of the specified entity type that matches the given name.
 
         :param entity_name: String that designates the entity (as it appears in Badgr
@@ -132,9 +133,9 @@ class BadgrUtils(object):
         :param entity_type: valid types are ('issuer', 'badgeclass')
         """
         if entity_type == "issuer":
-            all_entities = self.get_issuers()
+            all_entities = await self.get_issuers()
         elif entity_type == "badgeclass":
-            all_entities = self.get_badgeclasses(**kwargs)
+            all_entities = await self.get_badgeclasses(**kwargs)
 
         entity_name_dict = dict(
             [
@@ -164,21 +165,23 @@ class BadgrUtils(object):
 
         return entity_name_dict[entity_name]
 
-    def get_badgeclass_entity(self, badgeclass_name):
+    async def get_badgeclass_entity(self, badgeclass_name):
         """Returns the BadgeClass entityID corresponding to the given Issuer and
         Badgeclass name combination.
 
         :param badgeclass_name: String that corresponds to the BadgeClass name (as it
             appears in Badgr web).
         """
-        issuer_id = self._get_matching_entity_id(self.issuer_name, entity_type="issuer")
-        badgeclass_id = self._get_matching_entity_id(
+        issuer_id = await self._get_matching_entity_id(
+            self.issuer_name, entity_type="issuer"
+        )
+        badgeclass_id = await self._get_matching_entity_id(
             badgeclass_name, entity_type="badgeclass", issuer_id=issuer_id
         )
         return badgeclass_id
 
     @refresh_token
-    def issue_badge(
+    async def issue_badge(
         self,
         badge_type,
         badgeclass_name,
@@ -207,7 +210,7 @@ class BadgrUtils(object):
         :param sw_criteria: List of fulfilled criteria codes from the Software baseline
         :param srv_criteria: List of fulfilled criteria codes from the Service baseline
         """
-        badgeclass_id = self.get_badgeclass_entity(badgeclass_name)
+        badgeclass_id = await self.get_badgeclass_entity(badgeclass_name)
         self.logger.info(
             (
                 "BadgeClass entityId found for Issuer <%s> and BadgeClass "
@@ -260,28 +263,29 @@ class BadgrUtils(object):
                 "'POST %s'" % (badgeclass_name, path)
             )
         )
-        r = requests.post(
+        session = http_client.get_session()
+        async with session.post(
             urljoin(self.endpoint, path), headers=headers, data=assertion_data
-        )
-        r_json = r.json()
-        self.logger.debug("Result from 'POST %s': %s" % (path, r_json))
+        ) as r:
+            r_json = await r.json(content_type=None)
+            self.logger.debug("Result from 'POST %s': %s" % (path, r_json))
 
-        if r.ok:
-            if len(r_json["result"]) > 1:
-                self.logger.warn("More than one badge being issued")
+            if r.ok:
+                if len(r_json["result"]) > 1:
+                    self.logger.warn("More than one badge being issued")
 
-            # Return the first result
-            return r_json["result"][0]
-        else:
-            if "fieldErrors" in r_json.keys() and r_json["fieldErrors"]:
-                self.logger.warn(
-                    "Unsuccessful POST (Field errors): %s" % r_json["fieldErrors"]
-                )
-            if "validationErrors" in r_json.keys() and r_json["validationErrors"]:
-                self.logger.warn(
-                    (
-                        "Unsuccessful POST (Validation errors): "
-                        "%s" % r_json["validationErrors"]
+                # Return the first result
+                return r_json["result"][0]
+            else:
+                if "fieldErrors" in r_json.keys() and r_json["fieldErrors"]:
+                    self.logger.warn(
+                        "Unsuccessful POST (Field errors): %s" % r_json["fieldErrors"]
                     )
-                )
-            r.raise_for_status()
+                if "validationErrors" in r_json.keys() and r_json["validationErrors"]:
+                    self.logger.warn(
+                        (
+                            "Unsuccessful POST (Validation errors): "
+                            "%s" % r_json["validationErrors"]
+                        )
+                    )
+                r.raise_for_status()
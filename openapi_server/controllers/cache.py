@@ -0,0 +1,73 @@
+# SPDX-FileCopyrightText: Copyright contributors to the Software Quality Assurance as a Service (SQAaaS) project <sqaaas@ibergrid.eu>
+#
+# SPDX-License-Identifier: GPL-3.0-only
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache(object):
+    """Thread-safe, size-bounded (LRU) cache with optional expiration time."""
+
+    def __init__(self, maxsize=128, ttl=None):
+        """TTLCache object definition.
+
+        :param maxsize: Maximum number of entries kept in the cache
+        :param ttl: Time (in seconds) an entry is valid. No expiration if None
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Returns the value stored for the given key (or default if missing or
+        expired).
+
+        :param key: Key of the cache entry
+        :param default: Value returned when the key is not cached
+        """
+        with self._lock:
+            try:
+                value, expires = self._data[key]
+            except KeyError:
+                return default
+            if expires is not None and expires < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        """Stores the value for the given key.
+
+        :param key: Key of the cache entry
+        :param value: Value to be cached
+        :param ttl: Overrides the default expiration time for this entry
+        """
+        ttl = ttl if ttl is not None else self.ttl
+        expires = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        """Removes the entry for the given key, returning its value.
+
+        :param key: Key of the cache entry
+        :param default: Value returned when the key is not cached
+        """
+        with self._lock:
+            value, _ = self._data.pop(key, (default, None))
+            return value
+
+    def clear(self):
+        """Removes all the entries from the cache."""
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key):
+        return self.get(key, default=self) is not self
@@ -16,6 +16,11 @@ from openapi_server.controllers.jepl import JePLUtils
 DB_FILE = pathlib.Path(config.get("db_file", fallback="/sqaaas/sqaaas.json"))
 logger = logging.getLogger("sqaaas.api.controller.db")
 
+# In-memory index of the Jenkins data of the pipelines, so that the lookups by job
+# or build status do not load the whole DB. It is built on first use and kept up
+# to date by the functions that modify the Jenkins data
+_jenkins_index = None
+
 
 def load_content():
     data = {}
@@ -35,6 +40,39 @@ def store_content(data):
     DB_FILE.write_text(json.dumps(data), encoding="utf-8")
 
 
+def _update_jenkins_index(pipeline_id, pipeline_data=None):
+    """Updates the index entry of the given pipeline.
+
+    :param pipeline_id: UUID-format identifier for the pipeline.
+    :param pipeline_data: Data of the pipeline (None if it was removed).
+    """
+    if _jenkins_index is None:
+        return
+    jenkins_data = (pipeline_data or {}).get("jenkins", None)
+    if jenkins_data:
+        _jenkins_index[pipeline_id] = {
+            "jenkins": copy.deepcopy(jenkins_data),
+            "qaa": "qaa" in pipeline_data,
+        }
+    else:
+        _jenkins_index.pop(pipeline_id, None)
+
+
+def get_jenkins_index():
+    """Returns the Jenkins data (<jenkins>) of the pipelines that have been run,
+    indexed by pipeline ID. The <qaa> flag marks the assessment pipelines.
+
+    Entries are shared with the index: they must not be modified.
+    """
+    global _jenkins_index
+    if _jenkins_index is None:
+        _jenkins_index = {}
+        for pipeline_id, pipeline_data in load_content().items():
+            _update_jenkins_index(pipeline_id, pipeline_data)
+        logger.debug("Jenkins index built (%s pipelines)" % len(_jenkins_index))
+    return dict(_jenkins_index)
+
+
 def print_content():
     db = load_content()
     logger.debug("Current DB content: %s" % list(db))
@@ -110,6 +148,7 @@ def add_entry(
         "tools": tool_criteria_map,
     }
     store_content(db)
+    _update_jenkins_index(pipeline_id, db[pipeline_id])
 
 
 def get_entry(pipeline_id=None):
@@ -140,6 +179,7 @@ def del_entry(pipeline_id):
     db = load_content()
     db.pop(pipeline_id)
     store_content(db)
+    _update_jenkins_index(pipeline_id)
     logger.debug("Pipeline <%s> removed from DB" % pipeline_id)
 
 
@@ -154,6 +194,7 @@ def update_entry(pipeline_id, **kwargs):
         if k in db[pipeline_id].keys():
             db[pipeline_id][k] = v
     store_content(db)
+    _update_jenkins_index(pipeline_id, db[pipeline_id])
     logger.debug(
         "Updated values in DB for pipeline <%s>. Keys updated: %s"
         % (pipeline_id, list(kwargs))
@@ -173,6 +214,8 @@ def update_jenkins(
     creds_tmp=[],
     creds_folder=None,
     issue_badge=False,
+    notified=False,
+    synced_at=None,
 ):
     """Updates the Jenkins data in the DB for the given pipeline ID.
 
@@ -190,6 +233,10 @@ def update_jenkins(
     :param creds_tmp: List of temporary credentials associated with the job.
     :param issue_badge: Flag to indicate whether to issue a badge when the pipeline
         succeeds.
+    :param notified: Flag to indicate whether the build data is being notified by
+        Jenkins.
+    :param synced_at: Timestamp of the last time the build data was synced with
+        Jenkins.
     """
     db = load_content()
     db[pipeline_id]["jenkins"] = {
@@ -202,18 +249,105 @@ def update_jenkins(
             "number": build_no,
             "url": build_url,
             "status": build_status,
+            "notified": notified,
+            "synced_at": synced_at,
         },
         "scan_org_wait": scan_org_wait,
         "creds_tmp": creds_tmp,
         "creds_folder": creds_folder,
     }
     store_content(db)
+    _update_jenkins_index(pipeline_id, db[pipeline_id])
     logger.debug(
         "Jenkins data updated for pipeline <%s>: %s"
         % (pipeline_id, db[pipeline_id]["jenkins"])
     )
 
 
+def update_build_info(pipeline_id, build_data, scan_org_wait=None):
+    """Updates the given properties of the Jenkins build data in the DB for the
+    given pipeline ID.
+
+    :param pipeline_id: UUID-format identifier for the pipeline.
+    :param build_data: Dictionary containing the build properties to update.
+    :param scan_org_wait: Boolean that represents whether the Jenkins' scan
+        organisation has been triggered (not updated if None).
+    """
+    db = load_content()
+    jenkins_data = db[pipeline_id]["jenkins"]
+    jenkins_data["build_info"].update(build_data)
+    if scan_org_wait is not None:
+        jenkins_data["scan_org_wait"] = scan_org_wait
+    store_content(db)
+    _update_jenkins_index(pipeline_id, db[pipeline_id])
+    logger.debug(
+        "Jenkins build data updated for pipeline <%s>: %s"
+        % (pipeline_id, jenkins_data["build_info"])
+    )
+
+
+def _get_build_key(build_no, build_id):
+    """Returns the key of the build (number & queue ID) in the stored stage
+    validations, as build numbers start over if the job is created again.
+
+    :param build_no: Jenkins' job build number.
+    :param build_id: Identity of the build (e.g. queue ID).
+    """
+    return "%s-%s" % (build_no, build_id)
+
+
+def add_stage_validation(pipeline_id, build_no, build_id, stage_name, validation_data):
+    """Stores the validation data of a pipeline stage. Only the data from the
+    given build is kept.
+
+    :param pipeline_id: UUID-format identifier for the pipeline.
+    :param build_no: Jenkins' job build number.
+    :param build_id: Identity of the build (e.g. queue ID). The validation data is
+        only stored when given.
+    :param stage_name: Name of the pipeline stage.
+    :param validation_data: Validation data of the stage.
+    """
+    if build_id is None:
+        return
+    build_key = _get_build_key(build_no, build_id)
+    db = load_content()
+    stage_validation = db[pipeline_id].get("stage_validation", {})
+    build_validation = stage_validation.get(build_key, {})
+    build_validation[stage_name] = validation_data
+    db[pipeline_id]["stage_validation"] = {build_key: build_validation}
+    store_content(db)
+    logger.debug(
+        "Validation data for stage <%s> (build no: %s) stored in DB for pipeline "
+        "<%s>" % (stage_name, build_no, pipeline_id)
+    )
+
+
+def get_stage_validation(pipeline_id, build_no, build_id):
+    """Returns the validation data of the stages from the given build, indexed by
+    stage name.
+
+    :param pipeline_id: UUID-format identifier for the pipeline.
+    :param build_no: Jenkins' job build number.
+    :param build_id: Identity of the build (e.g. queue ID).
+    """
+    if build_id is None:
+        return {}
+    pipeline_data = get_entry(pipeline_id)
+    stage_validation = pipeline_data.get("stage_validation", {})
+    return stage_validation.get(_get_build_key(build_no, build_id), {})
+
+
+def clear_stage_validation(pipeline_id):
+    """Removes the stored validation data of the pipeline stages.
+
+    :param pipeline_id: UUID-format identifier for the pipeline.
+    """
+    db = load_content()
+    if db[pipeline_id].pop("stage_validation", None) is not None:
+        store_content(db)
+        logger.debug("Stage validation data removed for pipeline <%s>" % pipeline_id)
+
+
 def add_badge_data(pipeline_id, badge_data):
     """Updates the Badgr data in the DB for the given pipeline ID.
 
@@ -238,6 +372,7 @@ def add_assessment_data(pipeline_id, assessment_data):
     db = load_content()
     db[pipeline_id]["qaa"] = assessment_data
     store_content(db)
+    _update_jenkins_index(pipeline_id, db[pipeline_id])
     logger.debug(
         "QAA data added in DB for pipeline <%s>: %s"
         % (pipeline_id, db[pipeline_id]["qaa"])
@@ -276,6 +411,37 @@ def add_repo_settings(pipeline_id, repo_settings):
     )
 
 
+def add_pull_request(pipeline_id, repo_name, branch, pr_data):
+    """Stores the data of the pull request created in the given repository.
+
+    :param pipeline_id: UUID-format identifier for the pipeline.
+    :param repo_name: Name of the target repository (format: <user|org>/<repo_name>).
+    :param branch: Name of the target branch.
+    :param pr_data: Pull request data (number, URL & head).
+    """
+    db = load_content()
+    pull_requests = db[pipeline_id].setdefault("pull_requests", {})
+    pull_requests["%s@%s" % (repo_name, branch)] = pr_data
+    store_content(db)
+    logger.debug(
+        "Pull request data updated in DB for pipeline <%s>: %s"
+        % (pipeline_id, pr_data)
+    )
+
+
+def get_pull_request(pipeline_id, repo_name, branch):
+    """Returns the data of the pull request created in the given repository (or
+    None if not found).
+
+    :param pipeline_id: UUID-format identifier for the pipeline.
+    :param repo_name: Name of the target repository (format: <user|org>/<repo_name>).
+    :param branch: Name of the target branch.
+    """
+    pipeline_data = get_entry(pipeline_id)
+    pull_requests = pipeline_data.get("pull_requests", {})
+    return pull_requests.get("%s@%s" % (repo_name, branch), None)
+
+
 def update_environment(pipeline_id, envvar_data):
     """Updates the config.yml's environment data in the DB for the given pipeline
     ID.
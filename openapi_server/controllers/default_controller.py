@@ -7,15 +7,18 @@ import asyncio
 import base64
 import calendar
 import copy
+import hashlib
+import hmac
 import io
 import json
 import logging
 import os
 import re
+import time
 import uuid
+import weakref
 from importlib.metadata import version as impversion
 from importlib.resources import files as impfiles
-from typing import Dict, List
 from urllib import parse as urllib_parse
 from zipfile import ZipFile, ZipInfo
 
@@ -31,6 +34,7 @@ import openapi_server
 from openapi_server import config, controllers
 from openapi_server.controllers import crypto as crypto_utils
 from openapi_server.controllers import db
+from openapi_server.controllers import log_stream
 from openapi_server.controllers import utils as ctls_utils
 from openapi_server.controllers.git import GitUtils
 from openapi_server.controllers.jepl import JePLUtils
@@ -45,6 +49,39 @@ GITHUB_ORG = config.get_repo("organization")
 JENKINS_GITHUB_ORG = config.get_ci("github_organization_name")
 JENKINS_CREDENTIALS_FOLDER = config.get_ci("credentials_folder")
 JENKINS_COMPLETED_STATUS = ["SUCCESS", "FAILURE", "UNSTABLE", "ABORTED"]
+# Shared token to authenticate the build notifications sent by Jenkins
+JENKINS_NOTIFICATION_TOKEN = config.get_ci("notification_token", fallback=None)
+# Time (in seconds) the build data notified by Jenkins is trusted before checking
+# it again in Jenkins
+JENKINS_RECONCILE_INTERVAL = int(
+    config.get_ci("notification_reconcile_interval", fallback=300)
+)
+# Time (in seconds) between requests to Jenkins while waiting for a build to
+# start (slower by default when the builds are notified by Jenkins)
+JENKINS_POLL_INTERVAL = float(
+    config.get_ci("poll_interval", fallback=30 if JENKINS_NOTIFICATION_TOKEN else 3)
+)
+# Whether the status of the running builds is tracked by a background poller
+BUILD_STATUS_POLLER = config.get_boolean("build_status_poller", fallback=True)
+# Time (in seconds) between the checks of a build by the poller, growing with the
+# time the build has been tracked
+BUILD_POLLER_MIN_INTERVAL = float(config.get_ci("poller_min_interval", fallback=5))
+BUILD_POLLER_MAX_INTERVAL = float(config.get_ci("poller_max_interval", fallback=60))
+# Maximum time (in seconds) the poller waits for the job & build of a pipeline to
+# show up in Jenkins
+BUILD_POLLER_TIMEOUT = float(config.get_ci("poller_timeout", fallback=3600))
+# Minimum time (in seconds) between the checks for finished stages of a running
+# assessment build (unless the build status changes)
+STAGE_VALIDATION_INTERVAL = float(
+    config.get_ci("stage_validation_interval", fallback=60)
+)
+# Order of the build events notified by Jenkins
+JENKINS_NOTIFICATION_PHASES = {
+    "QUEUED": 0,
+    "STARTED": 1,
+    "COMPLETED": 2,
+    "FINALIZED": 2,
+}
 TOOLING_QAA_SPECIFIC_KEY = "tools_qaa_specific"
 ASSESSMENT_REPORT_LOCATION = config.get(
     "assessment_report_location", fallback=".report/assessment_output.json"
@@ -52,6 +89,13 @@ ASSESSMENT_REPORT_LOCATION = config.get(
 STATUS_BADGE_LOCATION = config.get(
     "status_badge_location", fallback=".badge/status_shields.svg"
 )
+# Time window (in seconds) to coalesce the status badge updates in a single commit
+STATUS_BADGE_PUSH_DELAY = float(config.get("status_badge_push_delay", fallback=10))
+# Whether to commit the status badge to the pipeline repository (it is anyway
+# served through the API)
+STATUS_BADGE_COMMIT = config.get_boolean("status_badge_commit", fallback=True)
+# Time (in seconds) clients may cache the status badge served by the API
+STATUS_BADGE_MAX_AGE = int(config.get("status_badge_max_age", fallback=60))
 
 SW_PREFIX = "QC"
 SRV_PREFIX = "SvcQC"
@@ -67,6 +111,20 @@ logger = logging.getLogger("sqaaas.api.controller")
 
 git_utils, gh_utils, jk_utils, badgr_utils = controllers.init_utils()
 
+# Status badges waiting to be pushed, per pipeline ID
+_pending_badges = {}
+# Locks that serialize the pushes to the same repository branch
+_repo_push_locks = weakref.WeakValueDictionary()
+# Builds tracked by the build status poller, per pipeline ID
+_polled_builds = {}
+_build_poller_task = None
+# Set to check the due builds before the poller's next scheduled run
+_build_poller_wakeup = None
+# Pipelines whose finished stages are being validated
+_validating_pipelines = set()
+# Stages already validated, per pipeline ID: (<build number>, <stage names>)
+_validated_stages = {}
+
 
 async def _add_pipeline_to_db(body, branch_upstream=None, report_to_stdout=False):
     """Stores the pipeline into the database.
@@ -340,29 +398,32 @@ async def _get_tooling_for_assessment(
     # Get the tools that are relevant based on the repo content (add them to
     # <criteria_data_list_filtered>) and also the ones that are not (add them
     # in <criteria_filtered>)
+    # NOTE: each repository is cloned & filtered concurrently in the git worker
+    # pool. Results are merged following the order of <relevant_criteria_data>
     criteria_data_list_filtered = []
     criteria_filtered = {}
-    for repo_criteria_mapping in relevant_criteria_data:
-        try:
-            (
-                _criteria_data_list_filtered,
-                _criteria_filtered,
-                _repo_settings,
-            ) = _filter_tools(**repo_criteria_mapping)
-        except SQAaaSAPIException as e:
-            raise e
+    filter_results = await asyncio.gather(
+        *[
+            GitUtils.run_in_pool(_filter_tools, **repo_criteria_mapping)
+            for repo_criteria_mapping in relevant_criteria_data
+        ]
+    )
+    for (
+        _criteria_data_list_filtered,
+        _criteria_filtered,
+        _repo_settings,
+    ) in filter_results:
+        criteria_data_list_filtered.extend(_criteria_data_list_filtered)
+        criteria_filtered.update(_criteria_filtered)
+        # Feed 'repositories' with '_repo_settings'
+        _update_key = None
+        if _repo_settings.get("is_main_repo", False):
+            _update_key = main_repo_key
         else:
-            criteria_data_list_filtered.extend(_criteria_data_list_filtered)
-            criteria_filtered.update(_criteria_filtered)
-            # Feed 'repositories' with '_repo_settings'
-            _update_key = None
-            if _repo_settings.get("is_main_repo", False):
-                _update_key = main_repo_key
-            else:
-                if "repo_docs" in repositories.keys():
-                    _update_key = "repo_docs"
-            if _update_key:
-                repositories[_update_key].update(_repo_settings)
+            if "repo_docs" in repositories.keys():
+                _update_key = "repo_docs"
+        if _update_key:
+            repositories[_update_key].update(_repo_settings)
 
     if not criteria_data_list_filtered:
         _reason = "Could not find any tool for criteria assessment"
@@ -695,24 +756,10 @@ async def add_pipeline_for_assessment(
             if platform in ["github"]:
                 gh_repo_name = _repo_data["name"]
                 try:
-                    gh_repo = gh_utils.get_repository(
-                        gh_repo_name, _main_repo_creds, raise_exception=True
-                    )
                     _repo_settings.update(
-                        {
-                            "avatar_url": gh_utils.get_avatar(
-                                gh_repo_name, _main_repo_creds
-                            ),
-                            "description": gh_utils.get_description(repo=gh_repo),
-                            "languages": gh_utils.get_languages(repo=gh_repo),
-                            "topics": gh_utils.get_topics(repo=gh_repo),
-                            "stargazers_count": gh_utils.get_stargazers(repo=gh_repo),
-                            "watchers_count": gh_utils.get_watchers(repo=gh_repo),
-                            "contributors_count": gh_utils.get_contributors(
-                                repo=gh_repo
-                            ),
-                            "forks_count": gh_utils.get_forks(repo=gh_repo),
-                        }
+                        await asyncio.to_thread(
+                            gh_utils.get_repo_settings, gh_repo_name, _main_repo_creds
+                        )
                     )
                 except SQAaaSAPIException as e:
                     _reason = e.message
@@ -1119,14 +1166,17 @@ async def run_pipeline(
             )
         )
         logger.debug("Create target repository: %s" % pipeline_repo_url)
-        gh_utils.create_org_repository(pipeline_repo)
+        await asyncio.to_thread(gh_utils.create_org_repository, pipeline_repo)
         logger.debug(
             "Clone & Push source repository <%s> to target repository <%s>"
             % (repo_url, pipeline_repo_url)
         )
         try:
-            pipeline_repo_branch = git_utils.clone_and_push(
-                repo_url, pipeline_repo_url, source_repo_branch=repo_branch
+            pipeline_repo_branch = await GitUtils.run_in_pool(
+                git_utils.clone_and_push,
+                repo_url,
+                pipeline_repo_url,
+                source_repo_branch=repo_branch,
             )
         except SQAaaSAPIException as e:
             logger.error(e.message)
@@ -1148,13 +1198,13 @@ async def run_pipeline(
         )
     else:
         _create_repo = False
-        _repo = gh_utils.get_repository(pipeline_repo)
+        _repo = await asyncio.to_thread(gh_utils.get_repository, pipeline_repo)
         if not _repo:
             _create_repo = True
         else:
             # Remove repo if empty
-            if not gh_utils.get_repo_content(pipeline_repo):
-                _repo.delete()
+            if not await asyncio.to_thread(gh_utils.get_repo_content, pipeline_repo):
+                await asyncio.to_thread(gh_utils.delete_repo, pipeline_repo)
                 _create_repo = True
                 logger.debug(
                     "Removing repository as part of re-creation:" "%s" % pipeline_repo
@@ -1163,8 +1213,11 @@ async def run_pipeline(
         if _create_repo:
             # Create repo from template (incl. README): use the same branch
             # name as upstream
-            _repo = gh_utils.create_org_repository(
-                pipeline_repo, branch=pipeline_repo_branch, include_readme=True
+            _repo = await asyncio.to_thread(
+                gh_utils.create_org_repository,
+                pipeline_repo,
+                branch=pipeline_repo_branch,
+                include_readme=True,
             )
         if not pipeline_repo_branch:
             pipeline_repo_branch = _repo.default_branch
@@ -1216,7 +1269,9 @@ async def run_pipeline(
                 )
                 creds_folder = JENKINS_GITHUB_ORG
 
-            jk_utils.create_credential(_id, _user_id, _token, folder_name=creds_folder)
+            await jk_utils.create_credential(
+                _id, _user_id, _token, folder_name=creds_folder
+            )
             creds_tmp.append(_id)
 
     # 1) Check if job already exists on Jenkins
@@ -1232,12 +1287,15 @@ async def run_pipeline(
     # 2) Include badge status in the commit
     badge_status = "not assessed"
     digital_object_type = pipeline_data["qaa"]["digital_object_type"]
-    additional_files_list.append(
-        {
-            "file_name": STATUS_BADGE_LOCATION,
-            "file_data": ctls_utils.get_status_badge(badge_status, digital_object_type),
-        }
-    )
+    if STATUS_BADGE_COMMIT:
+        additional_files_list.append(
+            {
+                "file_name": STATUS_BADGE_LOCATION,
+                "file_data": ctls_utils.get_status_badge(
+                    badge_status, digital_object_type
+                ),
+            }
+        )
     # Update DB
     _repo_settings = pipeline_data.get("repo_settings", [])
     for _repo_data in _repo_settings:
@@ -1246,20 +1304,30 @@ async def run_pipeline(
 
     # 3) Do the commit
     try:
-        commit_id = JePLUtils.push_files(
-            gh_utils,
-            pipeline_repo,
-            config_data_list,
-            composer_data,
-            jenkinsfile,
-            pipeline_data["data"]["commands_scripts"],
-            additional_files_list,
-            branch=pipeline_repo_branch,
-        )
+        async with _get_repo_push_lock(pipeline_repo, pipeline_repo_branch):
+            # Any badge queued from the previous build is superseded by the
+            # 'not assessed' one in this commit
+            _pop_pending_badge(pipeline_id)
+            # Stages validated for the previous build are not reused
+            _validated_stages.pop(pipeline_id, None)
+            db.clear_stage_validation(pipeline_id)
+            commit_id, commit_pushed = await asyncio.to_thread(
+                JePLUtils.push_files,
+                gh_utils,
+                pipeline_repo,
+                config_data_list,
+                composer_data,
+                jenkinsfile,
+                pipeline_data["data"]["commands_scripts"],
+                additional_files_list,
+                branch=pipeline_repo_branch,
+            )
     except SQAaaSAPIException as e:
         return web.Response(status=e.http_code, reason=e.message, text=e.message)
     else:
-        commit_url = gh_utils.get_commit_url(pipeline_repo, commit_id)
+        commit_url = await asyncio.to_thread(
+            gh_utils.get_commit_url, pipeline_repo, commit_id
+        )
 
     # 4) Automated-run check: previous commit should trigger the build
     build_job_task = None
@@ -1269,14 +1337,22 @@ async def run_pipeline(
             logger.error(_reason)
             raise SQAaaSAPIException(422, _reason)
         _build_to_check = last_build_no + 1
-        # Fire & forget _handle_job_building()
+        # Fire & forget _handle_job_building(): no build is triggered by the
+        # push when there was no commit, so the job is built manually right away
         build_job_task = asyncio.create_task(
-            _handle_job_building(jk_job_name, _build_to_check)
+            _handle_job_building(
+                jk_job_name,
+                _build_to_check,
+                pipeline_id=pipeline_id,
+                wait_trigger=commit_pushed,
+            )
         )
         if build_job_task.done():
             build_no, build_status, build_url, build_item_no = build_job_task.result()
     else:
-        jk_utils.scan_organization()
+        await jk_utils.scan_organization()
+        # Fire & forget _handle_scan_org_wait()
+        asyncio.create_task(_handle_scan_org_wait(pipeline_id, jk_job_name))
         scan_org_wait = True
         build_status = "WAITING_SCAN_ORG"
         reason = "Triggered scan organization for building the Jenkins job"
@@ -1321,10 +1397,12 @@ async def run_pipeline(
     return web.Response(status=204, reason=reason, text=reason)
 
 
-async def _handle_job_building(jk_job_name, build_to_check):
+async def _handle_job_building(
+    jk_job_name, build_to_check, pipeline_id=None, wait_trigger=True
+):
     # wait for automated triggering
     _build_triggered = False
-    _max_tries = 8
+    _max_tries = 8 if wait_trigger else 0
     _count_tries = 0
     build_no = None
     build_status = None
@@ -1333,6 +1411,19 @@ async def _handle_job_building(jk_job_name, build_to_check):
     while not _build_triggered:
         if _count_tries >= _max_tries:
             break
+        _count_tries += 1
+        # Build start is notified by Jenkins: only check Jenkins in the last try
+        if JENKINS_NOTIFICATION_TOKEN and pipeline_id:
+            build_info = _get_notified_build_info(pipeline_id)
+            if build_info and build_info["number"] == build_to_check:
+                _build_triggered = True
+                build_no = build_to_check
+                build_status = build_info["status"]
+                build_url = build_info["url"]
+                break
+            elif _count_tries < _max_tries:
+                await asyncio.sleep(5)
+                continue
         _job_info = jk_utils.get_job_info(jk_job_name)
         # NOTE (Jenkins API specific) First element of _builds
         # should match 'build_to_check'
@@ -1351,8 +1442,7 @@ async def _handle_job_building(jk_job_name, build_to_check):
                     % (_builds_last, build_to_check, jk_job_name)
                 )
             )
-        _count_tries += 1
-        await asyncio.sleep(5)
+            await asyncio.sleep(5)
     # Build manually if not triggered automatically
     if not _build_triggered:
         # <build_item_no> is only valid for about 5 min after job completion
@@ -1381,6 +1471,7 @@ async def _update_status(pipeline_id, triggered_by_run=False, build_task=None):
     build_item_no = None
 
     _pipeline_executed = False
+    _started_at = time.time()
 
     if build_task:
         if build_task.done():
@@ -1406,6 +1497,26 @@ async def _update_status(pipeline_id, triggered_by_run=False, build_task=None):
         logger.error(_reason)
         raise SQAaaSAPIException(422, _reason)
 
+    # Build data is kept up to date by the build status poller
+    if BUILD_STATUS_POLLER and not triggered_by_run:
+        logger.debug(
+            "Using build status stored by the poller for job <%s>: %s"
+            % (jk_job_name, build_status)
+        )
+        return (build_url, build_status)
+
+    # Build data notified by Jenkins is only checked again in Jenkins periodically
+    if _get_notified_build_info(pipeline_id) and not triggered_by_run:
+        _synced_at = build_info.get("synced_at", None) or 0
+        if build_status in JENKINS_COMPLETED_STATUS or (
+            time.time() - _synced_at < JENKINS_RECONCILE_INTERVAL
+        ):
+            logger.debug(
+                "Using build status notified by Jenkins for job <%s>: %s"
+                % (jk_job_name, build_status)
+            )
+            return (build_url, build_status)
+
     if jenkins_info["scan_org_wait"]:
         logger.debug("scan_org_wait still enabled for pipeline job: %s" % jk_job_name)
         _job_info = jk_utils.get_job_info(jk_job_name)
@@ -1436,7 +1547,20 @@ async def _update_status(pipeline_id, triggered_by_run=False, build_task=None):
                 if not build_task.done():
                     await build_task
                 build_no, build_status, build_url, build_item_no = build_task.result()
-                if build_item_no:
+                _build_info = _get_notified_build_info(pipeline_id)
+                if _build_info and _build_info["number"]:
+                    build_no = _build_info["number"]
+                    build_url = _build_info["url"]
+                    build_status = _build_info["status"]
+                    build_data = True
+                    logger.info(
+                        "Jenkins job build URL notified for repository <%s>: %s"
+                        % (pipeline_data["pipeline_repo"], build_url)
+                    )
+                elif build_item_no and BUILD_STATUS_POLLER:
+                    # Build number is obtained by the build status poller
+                    build_data = True
+                elif build_item_no:
                     build_data = await jk_utils.get_queue_item(build_item_no)
                     if build_data:
                         build_no = build_data["number"]
@@ -1451,44 +1575,42 @@ async def _update_status(pipeline_id, triggered_by_run=False, build_task=None):
                             "Could not get build data from Jenkins queue item: %s"
                             % build_item_no
                         )
-                        await asyncio.sleep(3)
+                        await asyncio.sleep(JENKINS_POLL_INTERVAL)
                 # End 'while' if build_no & build_status
                 elif build_no and build_status:
                     build_data = True
     else:
-        _status = jk_utils.get_build_info(jk_job_name, build_no)
-        if _status["result"]:
+        _status = jk_utils.get_build_status(jk_job_name, build_no)
+        if not _status:
+            logger.debug("Keeping current build status: %s" % build_status)
+        elif _status["result"]:
             build_status = _status["result"]
             logger.debug("Job result returned from Jenkins: %s" % _status["result"])
             # Set as UNSTABLE when cleanup stage fails
-            if jk_utils.cleanup_stage_failed(jk_job_name, build_no):
+            if _status["cleanup_failed"]:
                 build_status = "UNSTABLE"
                 logger.info("Cleanup stage failed: setting pipeline status to UNSTABLE")
         else:
-            if _status.get("queueId", None):
-                build_status = "EXECUTING"
-                logger.debug(
-                    "Jenkins job queueId found: setting job status to <EXECUTING>"
-                )
+            build_status = "EXECUTING"
+            logger.debug("Jenkins build is running: setting job status to <EXECUTING>")
     logger.info(
         "Build status <%s> for job: %s (build_no: %s)"
         % (build_status, jk_job_name, build_no)
     )
 
+    # Do not override the build data updated (notified by Jenkins or by the
+    # build status poller) in the meantime
+    _build_info = db.get_entry(pipeline_id)["jenkins"]["build_info"]
+    if (_build_info.get("synced_at", None) or 0) >= _started_at:
+        logger.debug(
+            "Build data for job <%s> updated while checking its status: %s"
+            % (jk_job_name, _build_info)
+        )
+        return (_build_info["url"], _build_info["status"])
+    _notified = _build_info.get("notified", False)
+
     # Update assessment status on DB (and push payload)
-    badge_status = None
-    if build_status in ["SUCCESS", "UNSTABLE"]:  # done, success
-        pass  # keep previous status
-    elif build_status in ["ABORTED", "FAILURE"]:  # done, failure
-        badge_status = "nullified"
-    elif build_status in ["WAITING_SCAN_ORG"]:
-        badge_status = "not assessed"  # hack to avoid doing a new commit
-    else:
-        badge_status = "building"
-    logger.debug(
-        "Got current badge status for assessment (build: %s): %s"
-        % (build_status, badge_status)
-    )
+    badge_status = _get_badge_status(build_status)
     await _handle_badge_status(pipeline_id, pipeline_data, badge_status)
 
     # Add build status to DB
@@ -1505,11 +1627,448 @@ async def _update_status(pipeline_id, triggered_by_run=False, build_task=None):
         creds_tmp=jenkins_info.get("creds_tmp", []),
         creds_folder=jenkins_info.get("creds_folder", None),
         issue_badge=jenkins_info["issue_badge"],
+        notified=_notified,
+        synced_at=time.time() if _notified else None,
     )
 
     return (build_url, build_status)
 
 
+def _get_in_flight_builds():
+    """Returns the index data (Jenkins data & assessment flag) of the pipelines
+    whose build has not completed, indexed by pipeline ID."""
+    in_flight_builds = {}
+    for pipeline_id, index_data in db.get_jenkins_index().items():
+        build_status = index_data["jenkins"]["build_info"].get("status", None)
+        if build_status in JENKINS_COMPLETED_STATUS + ["NOT_EXECUTED", "NOT_BUILT"]:
+            continue
+        in_flight_builds[pipeline_id] = index_data
+    return in_flight_builds
+
+
+def _check_stage_validation(pipeline_id, jk_job_name, build):
+    """Starts the validation of the finished stages of an assessment build, if
+    they might have changed since the last check.
+
+    Jenkins only reports the stages through the (per build) Stage View API, so
+    they are checked whenever the build status changes and, while the build is
+    running, every STAGE_VALIDATION_INTERVAL seconds.
+
+    :param pipeline_id: ID of the pipeline
+    :type pipeline_id: str
+    :param jk_job_name: job name including folder, name & branch
+    :type jk_job_name: str
+    :param build: Build data obtained by the poller
+    :type build: dict
+    """
+    schedule = _polled_builds.get(pipeline_id, None)
+    if schedule is None or pipeline_id in _validating_pipelines:
+        return
+    # Validations are only stored for builds with a known identity
+    if build.get("queueId", None) is None:
+        return
+    now = time.time()
+    build_key = (build["number"], build["queueId"], build["result"])
+    if (
+        schedule.get("validated_build", None) == build_key
+        and now - schedule.get("validated_at", 0) < STAGE_VALIDATION_INTERVAL
+    ):
+        return
+    schedule["validated_build"] = build_key
+    schedule["validated_at"] = now
+    asyncio.create_task(
+        _validate_finished_stages(
+            pipeline_id, jk_job_name, build["number"], build["queueId"]
+        )
+    )
+
+
+async def _update_polled_build(pipeline_id, index_data, folder_builds):
+    """Updates the build data of the pipeline with the one obtained by the build
+    status poller.
+
+    Returns False if the build was not found in Jenkins.
+
+    :param pipeline_id: ID of the pipeline
+    :type pipeline_id: str
+    :param index_data: Jenkins data (<jenkins>) & assessment flag (<qaa>) of the
+        pipeline, from the DB index
+    :type index_data: dict
+    :param folder_builds: Latest builds of the jobs within the pipeline's folder
+    :type folder_builds: dict
+    """
+    jenkins_info = index_data["jenkins"]
+    jk_job_name = jenkins_info["job_name"]
+    build_info = jenkins_info["build_info"]
+    builds = folder_builds.get(tuple(jk_utils.normalize_job_name(jk_job_name)), None)
+    if builds is None:
+        logger.debug("Jenkins job <%s> not found (yet) by the poller" % jk_job_name)
+        return False
+
+    build = None
+    if build_info["number"]:
+        _key, _value = "number", build_info["number"]
+    elif build_info["item_number"]:
+        _key, _value = "queueId", build_info["item_number"]
+    elif jenkins_info["scan_org_wait"] and builds:
+        # First build of the job, once scan organization finished
+        _key, _value = "number", builds[0]["number"]
+    else:
+        return False
+    for _build in builds:
+        if _build.get(_key, None) == _value:
+            build = _build
+            break
+    if not build:
+        logger.debug("Build not found (yet) by the poller for job: %s" % jk_job_name)
+        return False
+
+    # Validate the assessment stages as they finish
+    if index_data["qaa"]:
+        _check_stage_validation(pipeline_id, jk_job_name, build)
+
+    build_status = build["result"] or "EXECUTING"
+    if build["result"]:
+        # Set as UNSTABLE when cleanup stage fails
+        _cleanup_failed = await asyncio.to_thread(
+            jk_utils.cleanup_stage_failed, jk_job_name, build["number"]
+        )
+        if _cleanup_failed:
+            build_status = "UNSTABLE"
+            logger.info("Cleanup stage failed: setting pipeline status to UNSTABLE")
+    build_data = {
+        "number": build["number"],
+        "url": build["url"],
+        "status": build_status,
+        "synced_at": time.time(),
+    }
+    if build.get("queueId", None):
+        build_data["item_number"] = build["queueId"]
+    if all([build_info.get(k, None) == build_data[k] for k in ["number", "status"]]):
+        return True
+    db.update_build_info(pipeline_id, build_data, scan_org_wait=False)
+    logger.info(
+        "Build status <%s> obtained by the poller for job: %s (build_no: %s)"
+        % (build_status, jk_job_name, build["number"])
+    )
+    await _handle_badge_status(
+        pipeline_id, db.get_entry(pipeline_id), _get_badge_status(build_status)
+    )
+    return True
+
+
+async def _poll_builds():
+    """Checks in Jenkins the builds that are due, with a single request per
+    folder.
+
+    Returns the time (in seconds) until the next build is due.
+    """
+    now = time.time()
+    in_flight_builds = _get_in_flight_builds()
+    for pipeline_id in set(_polled_builds) - set(in_flight_builds):
+        _polled_builds.pop(pipeline_id)
+        _validated_stages.pop(pipeline_id, None)
+
+    due_builds = {}
+    for pipeline_id, index_data in in_flight_builds.items():
+        schedule = _polled_builds.setdefault(pipeline_id, {"since": now, "next": now})
+        if schedule["next"] <= now:
+            folder_name = index_data["jenkins"]["job_name"].split("/")[0]
+            due_builds.setdefault(folder_name, {})[pipeline_id] = index_data
+
+    for folder_name, folder_pipelines in due_builds.items():
+        try:
+            folder_builds = await asyncio.to_thread(
+                jk_utils.get_folder_builds, folder_name
+            )
+        except Exception as e:
+            logger.error(
+                "Could not get the builds for Jenkins folder <%s>: %s"
+                % (folder_name, e)
+            )
+            folder_builds = {}
+        for pipeline_id, index_data in folder_pipelines.items():
+            found = await _update_polled_build(pipeline_id, index_data, folder_builds)
+            schedule = _polled_builds[pipeline_id]
+            if found:
+                schedule["found_at"] = time.time()
+            elif (
+                time.time() - schedule.get("found_at", schedule["since"])
+                > BUILD_POLLER_TIMEOUT
+            ):
+                # Job or build never showed up (e.g. organization scan failed)
+                db.update_build_info(
+                    pipeline_id,
+                    {"status": "NOT_BUILT", "synced_at": time.time()},
+                    scan_org_wait=False,
+                )
+                _polled_builds.pop(pipeline_id)
+                _validated_stages.pop(pipeline_id, None)
+                logger.warning(
+                    "Build not found in Jenkins for job <%s> within %s seconds: "
+                    "setting pipeline <%s> status to NOT_BUILT"
+                    % (
+                        index_data["jenkins"]["job_name"],
+                        BUILD_POLLER_TIMEOUT,
+                        pipeline_id,
+                    )
+                )
+                continue
+            _interval = (time.time() - schedule["since"]) / 10
+            schedule["next"] = time.time() + min(
+                max(_interval, BUILD_POLLER_MIN_INTERVAL), BUILD_POLLER_MAX_INTERVAL
+            )
+
+    next_due = min(
+        [schedule["next"] for schedule in _polled_builds.values()],
+        default=now + BUILD_POLLER_MIN_INTERVAL,
+    )
+    return next_due - time.time()
+
+
+async def _run_build_poller():
+    """Keeps track of the status of the running builds."""
+    global _build_poller_wakeup
+    _build_poller_wakeup = asyncio.Event()
+    logger.info("Build status poller started")
+    while True:
+        try:
+            delay = await _poll_builds()
+        except Exception as e:
+            logger.error("Build status poller failed: %s" % e)
+            delay = BUILD_POLLER_MAX_INTERVAL
+        try:
+            await asyncio.wait_for(
+                _build_poller_wakeup.wait(),
+                min(max(delay, BUILD_POLLER_MIN_INTERVAL), BUILD_POLLER_MAX_INTERVAL),
+            )
+        except asyncio.TimeoutError:
+            pass
+        _build_poller_wakeup.clear()
+
+
+def _wake_build_poller(pipeline_id):
+    """Makes the build status poller check the given pipeline right away.
+
+    :param pipeline_id: ID of the pipeline
+    """
+    # Tracking is restarted, as the build is just starting
+    _polled_builds.pop(pipeline_id, None)
+    if _build_poller_wakeup is not None:
+        _build_poller_wakeup.set()
+
+
+async def _handle_scan_org_wait(pipeline_id, jk_job_name):
+    """Waits for the Jenkins job to be created by the organization scan.
+
+    Once the job is found, the build status poller is notified so that the
+    pipeline leaves the WAITING_SCAN_ORG status as soon as the build starts.
+
+    :param pipeline_id: ID of the pipeline
+    :param jk_job_name: Name of the Jenkins job
+    """
+    if not await jk_utils.wait_for_job(jk_job_name):
+        return
+    logger.info(
+        "Jenkins job <%s> created by the organization scan (pipeline: %s)"
+        % (jk_job_name, pipeline_id)
+    )
+    _wake_build_poller(pipeline_id)
+
+
+async def start_build_poller(app=None):
+    """Starts the build status poller (if enabled).
+
+    :param app: aiohttp application (when used as a startup signal handler)
+    """
+    global _build_poller_task
+    if BUILD_STATUS_POLLER and _build_poller_task is None:
+        _build_poller_task = asyncio.create_task(_run_build_poller())
+
+
+async def stop_build_poller(app=None):
+    """Stops the build status poller (if running).
+
+    :param app: aiohttp application (when used as a cleanup signal handler)
+    """
+    global _build_poller_task
+    if _build_poller_task is not None:
+        _build_poller_task.cancel()
+        try:
+            await _build_poller_task
+        except asyncio.CancelledError:
+            logger.info("Build status poller stopped")
+        _build_poller_task = None
+
+
+def _get_badge_status(build_status):
+    """Returns the status badge that corresponds to the given build status (None
+    if the previous one shall be kept).
+
+    :param build_status: String representing the build status.
+    :type build_status: str
+    """
+    badge_status = None
+    if build_status in ["SUCCESS", "UNSTABLE"]:  # done, success
+        pass  # keep previous status
+    elif build_status in ["ABORTED", "FAILURE"]:  # done, failure
+        badge_status = "nullified"
+    elif build_status in ["WAITING_SCAN_ORG"]:
+        badge_status = "not assessed"  # hack to avoid doing a new commit
+    else:
+        badge_status = "building"
+    logger.debug(
+        "Got current badge status for assessment (build: %s): %s"
+        % (build_status, badge_status)
+    )
+    return badge_status
+
+
+def _get_notified_build_info(pipeline_id):
+    """Returns the build data of the pipeline when it is being notified by
+    Jenkins (None otherwise).
+
+    :param pipeline_id: ID of the pipeline
+    :type pipeline_id: str
+    """
+    if not (JENKINS_NOTIFICATION_TOKEN and pipeline_id):
+        return None
+    jenkins_info = db.get_entry(pipeline_id).get("jenkins", {})
+    build_info = jenkins_info.get("build_info", {})
+    if not build_info.get("notified", False):
+        return None
+    return build_info
+
+
+def _get_pipeline_id_by_build(jk_job_name, build):
+    """Returns the ID of the pipeline that owns the notified build (None if not
+    found).
+
+    Several pipelines might share the same Jenkins job, so the build is matched
+    by its number, queue item or commit, in that order. Otherwise, the first
+    pipeline of the job whose build is in progress, and not yet numbered, is
+    returned.
+
+    :param jk_job_name: job name including folder, name & branch
+    :type jk_job_name: str
+    :param build: Build data from the Jenkins notification
+    :type build: dict
+    """
+    _job_name = jk_utils.normalize_job_name(jk_job_name)
+    job_pipelines = [
+        (pipeline_id, index_data["jenkins"])
+        for pipeline_id, index_data in db.get_jenkins_index().items()
+        if jk_utils.normalize_job_name(index_data["jenkins"]["job_name"]) == _job_name
+    ]
+    build_keys = [
+        ("number", build.get("number", None)),
+        ("item_number", build.get("queue_id", None)),
+        ("commit_id", build.get("scm", {}).get("commit", None)),
+    ]
+    for _key, _value in build_keys:
+        if not _value:
+            continue
+        for pipeline_id, jenkins_info in job_pipelines:
+            if jenkins_info["build_info"].get(_key, None) == _value:
+                return pipeline_id
+    for pipeline_id, jenkins_info in job_pipelines:
+        build_info = jenkins_info["build_info"]
+        if build_info.get("number", None):
+            continue
+        if build_info.get("status", None) not in JENKINS_COMPLETED_STATUS:
+            return pipeline_id
+    return None
+
+
+async def add_jenkins_notification(request: web.Request, body, token) -> web.Response:
+    """Receives build notifications from Jenkins.
+
+    Updates the build status of the pipeline associated with the notified job.
+    Not decorated with debug_request, so that the token is not logged.
+
+    :param body: Build notification (Jenkins Notification plugin format)
+    :type body: dict
+    :param token: Shared token to authenticate the notifications from Jenkins
+    :type token: str
+    """
+    logger.debug("Received Jenkins notification: %s" % body)
+    if not (
+        JENKINS_NOTIFICATION_TOKEN
+        and hmac.compare_digest(
+            token.encode("utf-8"), JENKINS_NOTIFICATION_TOKEN.encode("utf-8")
+        )
+    ):
+        _reason = "Invalid token supplied for Jenkins notification"
+        logger.warning(_reason)
+        return web.Response(status=403, reason=_reason, text=_reason)
+
+    build = body["build"]
+    phase = build["phase"]
+    jk_job_name = jk_utils.get_job_name_from_path(body["url"])
+    pipeline_id = _get_pipeline_id_by_build(jk_job_name, build)
+    if not pipeline_id:
+        _reason = "No pipeline found for Jenkins job: %s" % jk_job_name
+        logger.warning(_reason)
+        return web.Response(status=404, reason=_reason, text=_reason)
+
+    pipeline_data = db.get_entry(pipeline_id)
+    jenkins_info = pipeline_data["jenkins"]
+    build_info = jenkins_info["build_info"]
+    build_no = build.get("number", None)
+    commit_id = build.get("scm", {}).get("commit", None)
+    # Discard notifications from other builds
+    if commit_id and commit_id != build_info["commit_id"]:
+        _reason = "Discarding notification for commit: %s" % commit_id
+        logger.debug(_reason)
+        return web.Response(status=204, reason=_reason, text=_reason)
+    if build_info["number"]:
+        _build_no = build_no or build_info["number"]
+        _phase_previous = JENKINS_NOTIFICATION_PHASES.get(
+            build_info.get("phase", None), -1
+        )
+        if (_build_no, JENKINS_NOTIFICATION_PHASES[phase]) <= (
+            build_info["number"],
+            _phase_previous,
+        ):
+            _reason = "Discarding outdated notification for build #%s (%s)" % (
+                _build_no,
+                phase,
+            )
+            logger.debug(_reason)
+            return web.Response(status=204, reason=_reason, text=_reason)
+
+    build_data = {"phase": phase, "notified": True, "synced_at": time.time()}
+    if build.get("queue_id", None):
+        build_data["item_number"] = build["queue_id"]
+    if phase in ["QUEUED"]:
+        build_status = "QUEUED"
+    else:
+        build_data["number"] = build_no
+        build_data["url"] = build.get("full_url", None) or build_info["url"]
+        if phase in ["STARTED"]:
+            build_status = "EXECUTING"
+        else:
+            build_status = build.get("status", None)
+            # Set as UNSTABLE when cleanup stage fails
+            if build_status and await asyncio.to_thread(
+                jk_utils.cleanup_stage_failed, jk_job_name, build_no
+            ):
+                build_status = "UNSTABLE"
+                logger.info("Cleanup stage failed: setting pipeline status to UNSTABLE")
+    build_data["status"] = build_status
+    db.update_build_info(pipeline_id, build_data, scan_org_wait=False)
+    logger.info(
+        "Build status <%s> notified for job: %s (build_no: %s)"
+        % (build_status, jk_job_name, build_no)
+    )
+
+    await _handle_badge_status(
+        pipeline_id, pipeline_data, _get_badge_status(build_status)
+    )
+
+    return web.Response(status=204)
+
+
 @ctls_utils.debug_request
 @ctls_utils.validate_request
 async def get_pipeline_status(request: web.Request, pipeline_id) -> web.Response:
@@ -1684,48 +2243,98 @@ async def _get_tool_from_command(tool_criterion_map, stdout_command):
     return matched_tool
 
 
-async def _validate_output(stage_data_list, pipeline_data):
+async def _validate_stage_output(stage_data, pipeline_data):
+    """Validates the output obtained from a pipeline stage.
+
+    Returns a dict with the criterion, the output data (None if the validation is
+    broken) and the broken validation data (if any).
+
+    :param stage_data: Stage data gathered from Jenkins pipeline execution.
+    :type stage_data: dict
+    :param pipeline_data: Pipeline's data from DB
+    :type pipeline_data: dict
+    """
+    criterion_stage_data = copy.deepcopy(stage_data)
+    criterion_name = criterion_stage_data["criterion"]
+
+    logger.debug("Successful stage exit status for criterion <%s>" % criterion_name)
+    # Check if the command lies within a bash script
+    stdout_command = criterion_stage_data["stdout_command"]
+    commands_from_script = await _get_commands_from_script(
+        stdout_command, pipeline_data["data"]["commands_scripts"]
+    )
+    if commands_from_script:
+        logger.debug(
+            "Detected a bash script in the criterion <%s> "
+            "command. The real commands are: %s"
+            % (criterion_name, commands_from_script)
+        )
+        stdout_command = commands_from_script
+    tool_criterion_map = pipeline_data["tools"][criterion_name]
+    matched_tool = await _get_tool_from_command(tool_criterion_map, stdout_command)
+    criterion_stage_data["tool"] = matched_tool
+
+    logger.debug("Validating output from criterion <%s>" % criterion_name)
+    reporting_data, out, broken_data = await _run_validation(
+        criterion_name, **criterion_stage_data
+    )
+    if broken_data:
+        return {"criterion": criterion_name, "output": None, "broken": broken_data}
+
+    logger.debug("Output returned by <%s> tool validator: %s" % (matched_tool, out))
+    criterion_stage_data.update(reporting_data)
+    criterion_stage_data["validation"] = out
+
+    return {"criterion": criterion_name, "output": criterion_stage_data, "broken": None}
+
+
+async def _validate_output(
+    stage_data_list, pipeline_data, pipeline_id=None, build_no=None, build_id=None
+):
     """Validates the output obtained from the pipeline execution.
 
     Returns the data following according to GET /pipeline/<id>/output path
-    specification.
+    specification. Stages already validated while the build was running are not
+    validated again.
 
     :param stage_data_list: Per-stage data gathered from Jenkins pipeline execution.
     :type stage_data_list: list
     :param pipeline_data: Pipeline's data from DB
     :type pipeline_data: dict
+    :param pipeline_id: ID of the pipeline (to use the stored stage validations)
+    :type pipeline_id: str
+    :param build_no: Jenkins' job build number
+    :type build_no: int
+    :param build_id: Identity of the build (queue ID)
+    :type build_id: int
     """
     logger.debug("Output validation has been requested")
     output_data = {}
     broken_validation_data = {}
+    stage_validation = {}
+    if pipeline_id:
+        stage_validation = db.get_stage_validation(pipeline_id, build_no, build_id)
     for stage_data in stage_data_list:
-        criterion_stage_data = copy.deepcopy(stage_data)
-        criterion_name = criterion_stage_data["criterion"]
-
-        logger.debug("Successful stage exit status for criterion <%s>" % criterion_name)
-        # Check if the command lies within a bash script
-        stdout_command = criterion_stage_data["stdout_command"]
-        commands_from_script = await _get_commands_from_script(
-            stdout_command, pipeline_data["data"]["commands_scripts"]
-        )
-        if commands_from_script:
+        validation_data = stage_validation.get(stage_data["name"], None)
+        if validation_data:
             logger.debug(
-                "Detected a bash script in the criterion <%s> "
-                "command. The real commands are: %s"
-                % (criterion_name, commands_from_script)
+                "Using validation data obtained while running the stage <%s>"
+                % stage_data["name"]
             )
-            stdout_command = commands_from_script
-        tool_criterion_map = pipeline_data["tools"][criterion_name]
-        matched_tool = await _get_tool_from_command(tool_criterion_map, stdout_command)
-        criterion_stage_data["tool"] = matched_tool
-
-        logger.debug("Validating output from criterion <%s>" % criterion_name)
-        reporting_data, out, broken_data = await _run_validation(
-            criterion_name, **criterion_stage_data
-        )
+        else:
+            validation_data = await _validate_stage_output(stage_data, pipeline_data)
+            if pipeline_id:
+                db.add_stage_validation(
+                    pipeline_id,
+                    build_no,
+                    build_id,
+                    stage_data["name"],
+                    validation_data,
+                )
+        criterion_name = validation_data["criterion"]
 
         # If broken criterion, add to filtered criteria list
-        if broken_data:
+        if validation_data["broken"]:
             # Health check: broken criteria should not be already in
             # the list of filtered criteria
             if criterion_name in list(pipeline_data["qaa"]["criteria_filtered"]):
@@ -1736,25 +2345,73 @@ async def _validate_output(stage_data_list, pipeline_data):
                         "content.." % criterion_name
                     )
                 )
-            broken_validation_data[criterion_name] = broken_data
+            broken_validation_data[criterion_name] = validation_data["broken"]
             logger.info(
                 "Add broken criterion <%s> to filtered criteria list" % (criterion_name)
             )
             continue
 
-        logger.debug("Output returned by <%s> tool validator: %s" % (matched_tool, out))
-        criterion_stage_data.update(reporting_data)
-        criterion_stage_data["validation"] = out
-
         # Append if criterion is already there
         if criterion_name in list(output_data):
-            output_data[criterion_name].append(criterion_stage_data)
+            output_data[criterion_name].append(validation_data["output"])
         else:
-            output_data[criterion_name] = [criterion_stage_data]
+            output_data[criterion_name] = [validation_data["output"]]
 
     return (output_data, broken_validation_data)
 
 
+async def _validate_finished_stages(pipeline_id, jk_job_name, build_no, build_id):
+    """Validates the stages of the running build that have finished since the last
+    check, storing the validation data in the DB.
+
+    :param pipeline_id: ID of the pipeline
+    :type pipeline_id: str
+    :param jk_job_name: job name including folder, name & branch
+    :type jk_job_name: str
+    :param build_no: Jenkins' job build number
+    :type build_no: int
+    :param build_id: Identity of the build (queue ID)
+    :type build_id: int
+    """
+    if pipeline_id in _validating_pipelines:
+        return
+    _validating_pipelines.add(pipeline_id)
+    try:
+        build_key = (build_no, build_id)
+        _build_key, validated_stages = _validated_stages.get(pipeline_id, (None, None))
+        if _build_key != build_key:
+            validated_stages = set(
+                db.get_stage_validation(pipeline_id, build_no, build_id)
+            )
+            _validated_stages[pipeline_id] = (build_key, validated_stages)
+        stage_data_list = await jk_utils.get_stage_data(
+            jk_job_name,
+            build_no,
+            finished_only=True,
+            exclude_stages=list(validated_stages),
+        )
+        if stage_data_list:
+            pipeline_data = db.get_entry(pipeline_id)
+        for stage_data in stage_data_list:
+            validation_data = await _validate_stage_output(stage_data, pipeline_data)
+            db.add_stage_validation(
+                pipeline_id, build_no, build_id, stage_data["name"], validation_data
+            )
+            validated_stages.add(stage_data["name"])
+            logger.info(
+                "Stage <%s> validated for pipeline <%s> (build no: %s)"
+                % (stage_data["name"], pipeline_id, build_no)
+            )
+    except Exception as e:
+        # Stages are anyway validated when the output is requested
+        logger.warning(
+            "Could not validate finished stages for pipeline <%s>: %s"
+            % (pipeline_id, e)
+        )
+    finally:
+        _validating_pipelines.discard(pipeline_id)
+
+
 async def _get_output(pipeline_id, validate=False):
     """Handles the output gathering from pipeline execution.
 
@@ -1772,14 +2429,20 @@ async def _get_output(pipeline_id, validate=False):
     jenkins_info = pipeline_data["jenkins"]
     build_info = jenkins_info["build_info"]
 
-    stage_data_list = jk_utils.get_stage_data(
-        jenkins_info["job_name"], build_info["number"]
+    stage_data_list = await jk_utils.get_stage_data(
+        jenkins_info["job_name"],
+        build_info["number"],
+        build_id=build_info.get("item_number"),
     )
 
     output_data = stage_data_list
     if validate:
         output_data, broken_validation_data = await _validate_output(
-            stage_data_list, pipeline_data
+            stage_data_list,
+            pipeline_data,
+            pipeline_id=pipeline_id,
+            build_no=build_info["number"],
+            build_id=build_info.get("item_number"),
         )
         if broken_validation_data:
             pipeline_data["qaa"]["criteria_filtered"].update(broken_validation_data)
@@ -1817,6 +2480,47 @@ async def get_pipeline_output(
     return web.json_response(output_data, status=200)
 
 
+@ctls_utils.debug_request
+@ctls_utils.validate_request
+async def get_pipeline_output_stream(request: web.Request, pipeline_id) -> web.Response:
+    """Streams the console log of the pipeline execution.
+
+    Returns the console log of the running build as server-sent events, from the
+    moment of the subscription.
+
+    :param pipeline_id: ID of the pipeline to get
+    :type pipeline_id: str
+    """
+    pipeline_data = db.get_entry(pipeline_id)
+    jenkins_info = pipeline_data.get("jenkins", {})
+    build_no = jenkins_info.get("build_info", {}).get("number", None)
+    if not build_no:
+        _reason = "Pipeline <%s> build has not started yet" % pipeline_id
+        logger.error(_reason)
+        return web.Response(status=422, reason=_reason, text=_reason)
+
+    stream, queue = log_stream.subscribe(jk_utils, jenkins_info["job_name"], build_no)
+    response = web.StreamResponse(
+        status=200,
+        headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"},
+    )
+    await response.prepare(request)
+    try:
+        while True:
+            event = await queue.get()
+            if event is None:
+                break
+            await response.write(log_stream.format_event(event).encode("utf-8"))
+    except ConnectionResetError:
+        logger.debug(
+            "Client disconnected from log stream of pipeline <%s>" % pipeline_id
+        )
+    finally:
+        stream.unsubscribe(queue)
+
+    return response
+
+
 @ctls_utils.debug_request
 @ctls_utils.validate_request
 async def get_output_for_assessment(request: web.Request, pipeline_id) -> web.Response:
@@ -2238,13 +2942,25 @@ async def get_output_for_assessment(request: web.Request, pipeline_id) -> web.Re
         "Store resultant JSON report in the assessment "
         "repository: %s" % pipeline_repo
     )
-    commit = gh_utils.push_file(
-        file_name=ASSESSMENT_REPORT_LOCATION,
-        file_data=json.dumps(r, indent=4),
-        commit_msg="Add assessment report",
-        repo_name=pipeline_repo,
-        branch=pipeline_repo_branch,
-    )
+    files_to_push = [
+        {
+            "file_name": ASSESSMENT_REPORT_LOCATION,
+            "file_data": json.dumps(r, indent=4),
+            "delete": False,
+        }
+    ]
+    async with _get_repo_push_lock(pipeline_repo, pipeline_repo_branch):
+        # Any pending status badge goes in the same commit
+        badge_file = _pop_pending_badge(pipeline_id)
+        if badge_file:
+            files_to_push.append(badge_file)
+        commit, _ = await asyncio.to_thread(
+            gh_utils.push_files,
+            files_to_push,
+            commit_msg="Add assessment report",
+            repo_name=pipeline_repo,
+            branch=pipeline_repo_branch,
+        )
     if commit:
         logger.info(
             "Assessment report stored in repository <%s> under <%s> "
@@ -2291,7 +3007,9 @@ async def create_pull_request(request: web.Request, pipeline_id, body) -> web.Re
     logger.debug(
         "Target repository (base) formatted. Resultant name: %s" % target_repo_name
     )
-    target_repo = gh_utils.get_repository(target_repo_name, raise_exception=True)
+    target_repo = await asyncio.to_thread(
+        gh_utils.get_repository, target_repo_name, raise_exception=True
+    )
 
     target_branch_name = target_repo.default_branch
     if body.branch:
@@ -2301,19 +3019,38 @@ async def create_pull_request(request: web.Request, pipeline_id, body) -> web.Re
         % (target_repo_name, target_branch_name)
     )
 
+    # Pull request previously created for the same target (if any)
+    pr_record = db.get_pull_request(pipeline_id, target_repo_name, target_branch_name)
+
     # step 1: create the source repo (either fork or target repo itself)
-    fork_created = gh_utils.create_fork(target_repo_name)
+    fork_created = await asyncio.to_thread(gh_utils.create_fork, target_repo_name)
     if fork_created:
         source_repo = fork_created
         source_branch_name = fork_created.parent.default_branch
+    elif pr_record and await asyncio.to_thread(
+        gh_utils.get_pull_request,
+        target_repo_name,
+        pr_record["head"],
+        pr_number=pr_record["number"],
+    ):
+        # Reuse the branch of the open pull request
+        source_repo = target_repo
+        source_branch_name = pr_record["head"].split(":", 1)[1]
+        logger.debug(
+            "Source (head) branch <%s> reused from open pull request: %s"
+            % (source_branch_name, pr_record["html_url"])
+        )
     else:
         logger.debug("Source (head) and target (base) are the same repository")
         source_branch_name = "_".join(["sqaaas", namegenerator.gen()])
         logger.debug(
             "Source (head) random branch name generated: %s" % source_branch_name
         )
-        source_repo = gh_utils.create_branch(
-            target_repo_name, source_branch_name, target_branch_name
+        source_repo = await asyncio.to_thread(
+            gh_utils.create_branch,
+            target_repo_name,
+            source_branch_name,
+            target_branch_name,
         )
         logger.debug(
             "Branch <%s> created from head branch <%s>"
@@ -2331,7 +3068,8 @@ async def create_pull_request(request: web.Request, pipeline_id, body) -> web.Re
         )
         or []
     )
-    JePLUtils.push_files(
+    await asyncio.to_thread(
+        JePLUtils.push_files,
         gh_utils,
         source_repo.full_name,
         config_data_list,
@@ -2342,27 +3080,31 @@ async def create_pull_request(request: web.Request, pipeline_id, body) -> web.Re
         branch=source_branch_name,
     )
     # step 3: create PR if it does not exist
-    target_pr_data: List[Dict] = []
-    target_pr_data = [
-        {"html_url": pr.html_url, "data": (pr.head.repo.name, pr.head.ref)}
-        for pr in target_repo.get_pulls()
-        if pr.state in ["open"]
-    ]
-    source_repo_data = (source_repo.name, source_branch_name)
-    pr_exists = [
-        pr_data for pr_data in target_pr_data if pr_data["data"] == source_repo_data
-    ]
+    source_head = ":".join([source_repo.owner.login, source_branch_name])
+    pr_exists = await asyncio.to_thread(
+        gh_utils.get_pull_request,
+        target_repo_name,
+        source_head,
+        pr_number=pr_record["number"] if pr_record else None,
+    )
     if pr_exists:
-        pr_url = pr_exists[0]["html_url"]
-        logger.info("Pull request <%s> updated (already existed)" % pr_url)
+        pr_data = {"number": pr_exists.number, "html_url": pr_exists.html_url}
+        logger.info("Pull request <%s> updated (already existed)" % pr_data["html_url"])
     else:
-        pr = gh_utils.create_pull_request(
+        pr_data = await asyncio.to_thread(
+            gh_utils.create_pull_request,
             source_repo.full_name,
             source_branch_name,
             target_repo_name,
             target_branch_name,
         )
-        pr_url = pr["html_url"]
+    pr_url = pr_data["html_url"]
+    db.add_pull_request(
+        pipeline_id,
+        target_repo_name,
+        target_branch_name,
+        {"number": pr_data["number"], "html_url": pr_url, "head": source_head},
+    )
 
     r = {"pull_request_url": pr_url}
     return web.json_response(r, status=200)
@@ -2521,7 +3263,7 @@ async def _issue_badge(pipeline_id, badge_type, badgeclass_name):
                     badge_args[param].append(_repo_settings[param])
         logger.debug("Resultant badge arguments: %s" % badge_args)
     try:
-        badge_data = badgr_utils.issue_badge(
+        badge_data = await badgr_utils.issue_badge(
             badge_type=badge_type,
             badgeclass_name=badgeclass_name,
             build_commit_id=build_info["commit_id"],
@@ -2591,6 +3333,42 @@ async def get_badge(request: web.Request, pipeline_id) -> web.Response:
     return web.json_response(badge_obj, status=200)
 
 
+@ctls_utils.debug_request
+@ctls_utils.validate_request
+async def get_status_badge(request: web.Request, pipeline_id) -> web.Response:
+    """Gets the status badge of the given pipeline.
+
+    Returns the status badge (SVG format) of the assessment associated with the
+    pipeline.
+
+    :param pipeline_id: ID of the pipeline to get
+    :type pipeline_id: str
+    """
+    pipeline_data = db.get_entry(pipeline_id)
+    repo_settings = pipeline_data.get("repo_settings", [])
+    badge_status = None
+    if repo_settings:
+        badge_status = repo_settings[0].get("badge_status", None)
+    digital_object_type = pipeline_data.get("qaa", {}).get("digital_object_type", None)
+    if not (badge_status and digital_object_type):
+        _reason = "Status badge not available for pipeline <%s>" % pipeline_id
+        logger.error(_reason)
+        return web.Response(status=422, reason=_reason, text=_reason)
+
+    badge_svg = ctls_utils.get_status_badge(badge_status, digital_object_type)
+    etag = '"%s"' % hashlib.sha1(badge_svg.encode("utf-8")).hexdigest()
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "public, max-age=%s" % STATUS_BADGE_MAX_AGE,
+    }
+    if etag in request.headers.get("If-None-Match", ""):
+        return web.Response(status=304, headers=headers)
+
+    return web.Response(
+        status=200, text=badge_svg, content_type="image/svg+xml", headers=headers
+    )
+
+
 async def _get_tooling_metadata():
     """Returns the tooling metadata available in the given remote code
     repository."""
@@ -2612,7 +3390,8 @@ async def _get_tooling_metadata():
     tooling_metadata_json = {}
     if platform in ["github"]:
         short_repo_name = ctls_utils.get_short_repo_name(tooling_repo_url)
-        tooling_metadata_content = gh_utils.get_file(
+        tooling_metadata_content = await asyncio.to_thread(
+            gh_utils.get_file,
             tooling_metadata_file,
             short_repo_name,
             branch=tooling_repo_branch,
@@ -2823,23 +3602,122 @@ async def _handle_badge_status(pipeline_id, pipeline_data, badge_status=None):
                 % (pipeline_id, badge_status)
             )
             # Push badge
-            pipeline_repo = pipeline_data["pipeline_repo"]
-            pipeline_repo_branch = pipeline_data["pipeline_repo_branch"]
-            digital_object_type = pipeline_data["qaa"]["digital_object_type"]
-            gh_utils.push_file(
-                file_name=STATUS_BADGE_LOCATION,
-                file_data=ctls_utils.get_status_badge(
-                    badge_status, digital_object_type
-                ),
-                commit_msg="Update status badge",
-                repo_name=pipeline_repo,
-                branch=pipeline_repo_branch,
-            )
-            logger.info(
-                "New status badge pushed to repository <%s>: status <%s>"
-                % (pipeline_repo, badge_status)
-            )
+            if STATUS_BADGE_COMMIT:
+                _schedule_badge_push(pipeline_id, pipeline_data, badge_status)
         else:
             logger.debug("No change in status badge: %s" % badge_status)
 
     return repo_settings
+
+
+def _get_repo_push_lock(repo_name, branch):
+    """Returns the lock that serializes the pushes to the given repository branch.
+
+    Pushes are done from a snapshot of the branch, so concurrent pushes (e.g.
+    status badge & assessment report) would fail to update the branch.
+
+    :param repo_name: Name of the repo (format: <user|org>/<repo_name>)
+    :type repo_name: str
+    :param branch: Name of the branch
+    :type branch: str
+    """
+    key = (repo_name.lower(), branch)
+    lock = _repo_push_locks.get(key, None)
+    if lock is None:
+        lock = asyncio.Lock()
+        _repo_push_locks[key] = lock
+    return lock
+
+
+def _schedule_badge_push(pipeline_id, pipeline_data, badge_status):
+    """Queues the push of the status badge to the pipeline repository.
+
+    Updates within STATUS_BADGE_PUSH_DELAY seconds are coalesced, so only the
+    latest status is pushed.
+
+    :param pipeline_id: ID of the pipeline
+    :type pipeline_id: str
+    :param pipeline_data: Pipeline's data from DB
+    :type pipeline_data: dict
+    :param badge_status: status string to be displayed on the badge.
+    :type badge_status: str
+    """
+    pending = _pending_badges.get(pipeline_id, None)
+    if pending:
+        logger.debug(
+            "Status badge push already queued for pipeline <%s>: status <%s> "
+            "replaces <%s>" % (pipeline_id, badge_status, pending["status"])
+        )
+        pending["status"] = badge_status
+        return
+    _pending_badges[pipeline_id] = {
+        "status": badge_status,
+        "repo": pipeline_data["pipeline_repo"],
+        "branch": pipeline_data["pipeline_repo_branch"],
+        "digital_object_type": pipeline_data["qaa"]["digital_object_type"],
+    }
+    _pending_badges[pipeline_id]["task"] = asyncio.create_task(
+        _push_pending_badge(pipeline_id)
+    )
+
+
+def _pop_pending_badge(pipeline_id):
+    """Removes the status badge queued for the given pipeline.
+
+    Returns the file (dict with <file_name>, <file_data> & <delete> keys) with the
+    latest status badge, or None if there is no badge queued.
+
+    :param pipeline_id: ID of the pipeline
+    :type pipeline_id: str
+    """
+    pending = _pending_badges.pop(pipeline_id, None)
+    if not pending:
+        return None
+    task = pending["task"]
+    if task is not asyncio.current_task():
+        task.cancel()
+    return {
+        "file_name": STATUS_BADGE_LOCATION,
+        "file_data": ctls_utils.get_status_badge(
+            pending["status"], pending["digital_object_type"]
+        ),
+        "delete": False,
+    }
+
+
+async def _push_pending_badge(pipeline_id):
+    """Pushes the latest status badge queued for the given pipeline, once the
+    coalescing time window expires.
+
+    :param pipeline_id: ID of the pipeline
+    :type pipeline_id: str
+    """
+    await asyncio.sleep(STATUS_BADGE_PUSH_DELAY)
+    pending = _pending_badges.get(pipeline_id, {})
+    pipeline_repo = pending.get("repo", None)
+    if not pipeline_repo:
+        return
+    try:
+        async with _get_repo_push_lock(pipeline_repo, pending["branch"]):
+            # Badge might have been included in a push done meanwhile
+            badge_file = _pop_pending_badge(pipeline_id)
+            if not badge_file:
+                return
+            badge_status = pending["status"]
+            await asyncio.to_thread(
+                gh_utils.push_file,
+                file_name=badge_file["file_name"],
+                file_data=badge_file["file_data"],
+                commit_msg="Update status badge",
+                repo_name=pipeline_repo,
+                branch=pending["branch"],
+            )
+    except Exception as e:
+        logger.error(
+            "Could not push status badge to repository <%s>: %s" % (pipeline_repo, e)
+        )
+    else:
+        logger.info(
+            "New status badge pushed to repository <%s>: status <%s>"
+            % (pipeline_repo, badge_status)
+        )
@@ -3,12 +3,19 @@
 #
 # SPDX-License-Identifier: GPL-3.0-only
 
+import asyncio
 import functools
+import hashlib
 import logging
 import os
 import re
+import shutil
 import stat
 import tempfile
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 
 from git import Repo, cmd
 from git.exc import GitCommandError
@@ -22,6 +29,21 @@ logger = logging.getLogger("sqaaas.api.git")
 REMOTE_NAME = "sqaaas"
 
 CLONE_FOLDER = config.get_vcs("clone_folder", fallback="/tmp")
+MIRROR_FOLDER = config.get_vcs(
+    "mirror_folder", fallback=os.path.join(CLONE_FOLDER, "sqaaas-mirrors")
+)
+# Time (in days) an unused mirror is kept. Older mirrors are pruned, at most once
+# a day, when a repository is pushed
+MIRROR_MAX_AGE = float(config.get_vcs("mirror_max_age", fallback=30))
+GIT_WORKERS = int(config.get_vcs("workers", fallback=4))
+
+# Pool of workers for the (blocking) git operations, i.e. clones & pushes
+git_pool = ThreadPoolExecutor(max_workers=GIT_WORKERS, thread_name_prefix="sqaaas-git")
+
+# Per-mirror locks: the same mirror shall not be updated concurrently. Entries
+# are dropped once no thread holds the lock
+_mirror_locks = weakref.WeakValueDictionary()
+_mirror_locks_guard = threading.Lock()
 
 
 class GitUtils(object):
@@ -33,9 +55,11 @@ class GitUtils(object):
     def __init__(self, access_token):
         """GitUtils object definition.
 
-        :param access_token: Access token to access the remote Git repository
+        :param access_token: Access token to access the remote Git repository, or
+            callable that returns it (for short-lived tokens)
         """
         self.access_token = access_token
+        self._mirrors_pruned = 0
 
     @staticmethod
     def _custom_exception_messages(exc, **kwargs):
@@ -51,7 +75,7 @@ class GitUtils(object):
             message = "Repository not found or not accessible: %s" % kwargs["repo"]
         elif re.search("fatal: Remote branch (.+) not found", message):
             message = (
-                "Repository branch '%s'not found or not accessible for "
+                "Repository branch '%s' not found or not accessible for "
                 "repository: %s" % (kwargs["branch"], kwargs["repo"])
             )
         elif re.search("fatal: Authentication failed", message):
@@ -111,6 +135,17 @@ class GitUtils(object):
 
         return repo_url_final.url
 
+    @staticmethod
+    def _remove_git_creds(repo_url):
+        """Returns the given git URL without credentials (for messages & logs).
+
+        :param repo_url: URL of the git repository (may include credentials)
+        """
+        repo_url_parsed = parse_url(repo_url)
+        if not repo_url_parsed.auth:
+            return repo_url
+        return repo_url_parsed._replace(auth=None).url
+
     @staticmethod
     def get_default_branch_from_remote(repo_url, repo_creds={}):
         """Gets default branch name from a remote repository. It is useful when
@@ -130,7 +165,10 @@ class GitUtils(object):
             blob = g.ls_remote(repo_url, "HEAD", symref=True)
             branch = blob.split("\n")[0].split("/")[-1].split("\t")[0]
         except GitCommandError as e:
-            _msg = GitUtils._custom_exception_messages(e, repo=repo_url, branch=branch)
+            _msg = GitUtils._custom_exception_messages(
+                e, repo=repo_url_no_creds, branch=None
+            )
+            _msg = _msg.replace(repo_url, repo_url_no_creds)
             logger.error(_msg)
             raise SQAaaSAPIException(422, _msg)
         else:
@@ -140,54 +178,225 @@ class GitUtils(object):
             )
             return branch
 
-    def setup_env(self, dirpath):
-        """Setups the environment for handling remote repositories.
+    def get_env(self, dirpath):
+        """Returns the environment variables for handling remote repositories
+        (askpass helper & token).
+
+        Credentials are passed on a per-command basis (not through os.environ),
+        so concurrent git commands do not interfere with each other.
 
         :param dirpath: Directory to add the helper to
         """
         helper_path = os.path.join(dirpath, "git-askpass-helper.sh")
-        with open(helper_path, "w") as f:
-            f.writelines(
-                "%s\n" % line for line in ["#!/bin/sh", 'exec echo "$GIT_PASSWORD"']
+        if not os.path.exists(helper_path):
+            fd, tmp_path = tempfile.mkstemp(dir=dirpath)
+            with os.fdopen(fd, "w") as f:
+                f.writelines(
+                    "%s\n" % line
+                    for line in ["#!/bin/sh", 'exec echo "$GIT_PASSWORD"']
+                )
+            os.chmod(tmp_path, stat.S_IRWXU)
+            os.replace(tmp_path, helper_path)
+        access_token = self.access_token
+        if callable(access_token):
+            access_token = access_token()
+        return {"GIT_ASKPASS": helper_path, "GIT_PASSWORD": access_token}
+
+    @staticmethod
+    def get_commit_from_remote(repo_url, branch, env=None):
+        """Gets the commit ID (SHA format) the given remote branch points to.
+
+        :param repo_url: URL of the remote git repository (may include credentials)
+        :param branch: Name of the branch
+        :param env: Additional environment variables for the git command
+        """
+        g = cmd.Git()
+        try:
+            blob = g.ls_remote(repo_url, "refs/heads/%s" % branch, env=env)
+        except GitCommandError as e:
+            repo_url_no_creds = GitUtils._remove_git_creds(repo_url)
+            _msg = GitUtils._custom_exception_messages(
+                e, repo=repo_url_no_creds, branch=branch
+            )
+            _msg = _msg.replace(repo_url, repo_url_no_creds)
+            logger.error(_msg)
+            raise SQAaaSAPIException(422, _msg)
+        commit_id = None
+        if blob:
+            commit_id = blob.split("\n")[0].split("\t")[0]
+        return commit_id
+
+    @staticmethod
+    def get_file_from_remote(repo_url, file_path, branch=None, repo_creds={}):
+        """Gets the content of a single file from the remote repository.
+
+        Uses a shallow, blobless clone without checkout, so only the blob of the
+        given file is downloaded.
+
+        Returns a tuple with the commit ID (SHA format) and the content of the
+        file (None if the file does not exist in the given branch).
+
+        :param repo_url: URL of the git repository
+        :param file_path: Relative path to the file within the repository
+        :param branch: Name of the branch (default branch if not set)
+        :param repo_creds: dict with credential definition (Vault secret, Git
+            user/token)
+        """
+        source_repo = GitUtils._format_git_url(repo_url, repo_creds=repo_creds)
+        if not branch:
+            branch = GitUtils.get_default_branch_from_remote(repo_url, repo_creds)
+        with tempfile.TemporaryDirectory(dir=CLONE_FOLDER) as dirpath:
+            try:
+                repo = Repo.clone_from(
+                    source_repo,
+                    dirpath,
+                    single_branch=True,
+                    b=branch,
+                    depth=1,
+                    no_checkout=True,
+                    filter="blob:none",
+                )
+            except GitCommandError as e:
+                _msg = GitUtils._custom_exception_messages(
+                    e, repo=repo_url, branch=branch
+                )
+                _msg = _msg.replace(
+                    source_repo, GitUtils._remove_git_creds(source_repo)
+                )
+                logger.error(_msg)
+                raise SQAaaSAPIException(422, _msg)
+            commit_id = repo.head.commit.hexsha
+            try:
+                file_data = repo.git.show(
+                    "%s:%s" % (commit_id, file_path), strip_newline_in_stdout=False
+                )
+            except GitCommandError:
+                logger.debug(
+                    "File <%s> not found in repository <%s> (branch: %s)"
+                    % (file_path, repo_url, branch)
+                )
+                file_data = None
+            else:
+                logger.debug(
+                    "File <%s> fetched from repository <%s> (branch: %s)"
+                    % (file_path, repo_url, branch)
+                )
+
+        return (commit_id, file_data)
+
+    @staticmethod
+    def _get_mirror_lock(mirror_path):
+        """Returns the lock that guards the given mirror.
+
+        :param mirror_path: Path to the mirror
+        """
+        with _mirror_locks_guard:
+            lock = _mirror_locks.get(mirror_path)
+            if lock is None:
+                lock = threading.Lock()
+                _mirror_locks[mirror_path] = lock
+
+        return lock
+
+    @staticmethod
+    def _get_mirror(source_repo_no_creds, mirror_path):
+        """Returns the local bare mirror of the given source repository.
+
+        The mirror is created if it does not exist yet. Its lock MUST be held.
+
+        :param source_repo_no_creds: URL of the source repository
+        :param mirror_path: Path to the mirror
+        """
+        if os.path.exists(mirror_path):
+            repo = Repo(mirror_path)
+            # Mark as used, so that it is not pruned
+            os.utime(mirror_path)
+            logger.debug(
+                "Using existing mirror for repository <%s>: %s"
+                % (source_repo_no_creds, mirror_path)
+            )
+        else:
+            repo = Repo.init(mirror_path, bare=True, mkdir=True)
+            logger.debug(
+                "Created mirror for repository <%s>: %s"
+                % (source_repo_no_creds, mirror_path)
             )
-        os.chmod(helper_path, stat.S_IEXEC)
-        os.environ["GIT_ASKPASS"] = helper_path
-        os.environ["GIT_PASSWORD"] = self.access_token
-        logger.debug("Git environment set: askpass helper & env vars")
+
+        return repo
+
+    @staticmethod
+    def prune_mirrors(max_age=MIRROR_MAX_AGE):
+        """Removes the mirrors that have not been used within the given age.
+
+        Mirrors in use are skipped. Returns the number of removed mirrors.
+
+        :param max_age: Maximum age (in days) of the mirrors
+        """
+        expiry = time.time() - max_age * 86400
+        removed = 0
+        try:
+            entries = list(os.scandir(MIRROR_FOLDER))
+        except FileNotFoundError:
+            return 0
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            lock = GitUtils._get_mirror_lock(entry.path)
+            if not lock.acquire(blocking=False):
+                continue
+            try:
+                if os.stat(entry.path).st_mtime < expiry:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                    removed += 1
+            finally:
+                lock.release()
+        logger.debug("Pruned %s unused mirror/s" % removed)
+        return removed
+
+    @staticmethod
+    def _is_pushed(repo, source_commit_id, target_repo, target_commit_id, refs, env):
+        """Checks whether the source commit was already pushed to the target, i.e.
+        it is the commit recorded in the last push and is still an ancestor of the
+        target's branch.
+
+        :param repo: Mirror repository
+        :param source_commit_id: Commit ID (SHA format) of the source branch
+        :param target_repo: URL of the target repository
+        :param target_commit_id: Commit ID (SHA format) of the target's branch
+        :param refs: Tuple with the branch, last pushed and target tracking refs
+        :param env: Environment variables for the git commands
+        """
+        branch_ref, pushed_ref, target_tracking_ref = refs
+        commit_ids = {}
+        for ref in (pushed_ref, target_tracking_ref):
+            try:
+                commit_ids[ref] = repo.git.rev_parse(ref, verify=True)
+            except GitCommandError:
+                commit_ids[ref] = None
+        if commit_ids[pushed_ref] != source_commit_id:
+            return False
+        try:
+            # Only the commits on top of the last push (e.g. JePL files) are fetched
+            if commit_ids[target_tracking_ref] != target_commit_id:
+                repo.git.fetch(
+                    target_repo, "+%s:%s" % (branch_ref, target_tracking_ref), env=env
+                )
+            repo.git.merge_base(source_commit_id, target_tracking_ref, is_ancestor=True)
+        except GitCommandError:
+            return False
+
+        return True
 
     def clone_and_push(self, source_repo, target_repo, source_repo_branch=None):
         """Copies the source Git repository into the target one.
 
+        A bare mirror of the source repository is kept in MIRROR_FOLDER, so only the
+        new objects are fetched from the source and pushed to the target. No work is
+        done when the source commit has not changed since the last push and the
+        target branch still contains it (e.g. with the JePL files on top).
+
         Returns the target's branch name.
 
-        :param source_repo: Absolute URL of the source repository (e.g.
-        https://example.org)
-         :param target_repo: Absolute URL of the target repository (e.g.
-        https://github.com/org/example)
-         :param source_repo: Absolute URL of the source repository (e.g.
-        https://example.org)
-         :param target_repo: Absolute URL of the target repository (e.g.
-        https://github.com/org/example)
-         :param source_repo: Absolute URL of the source repository (e.g.
-        https://example.org)
-         :param target_repo: Absolute URL of the target repository (e.g.
-        https://github.com/org/example)
-         :param source_repo: Absolute URL of the source repository (e.g.
-        https://example.org)
-         :param target_repo: Absolute URL of the target repository (e.g.
-        https://github.com/org/example)
-        :param source_repo: Absolute URL of the source repository (e.g.
-            https://example.org)
-        :param target_repo: Absolute URL of the target repository (e.g.
-            https://github.com/org/example)
-        :param source_repo: Absolute URL of the source repository (e.g.
-            https://example.org)
-        :param target_repo: Absolute URL of the target repository (e.g.
-            https://github.com/org/example)
-        :param source_repo: Absolute URL of the source repository (e.g.
-            https://example.org)
-        :param target_repo: Absolute URL of the target repository (e.g.
-            https://github.com/org/example)
         :param source_repo: Absolute URL of the source repository (e.g.
             https://example.org)
         :param target_repo: Absolute URL of the target repository (e.g.
@@ -197,28 +406,102 @@ class GitUtils(object):
         """
         if not source_repo_branch:
             source_repo_branch = GitUtils.get_default_branch_from_remote(source_repo)
+        source_repo_no_creds = source_repo  # for logging purposes
         source_repo = GitUtils._format_git_url(source_repo)
-        with tempfile.TemporaryDirectory(dir=CLONE_FOLDER) as dirpath:
-            repo = None
+        source_commit_id = GitUtils.get_commit_from_remote(
+            source_repo, source_repo_branch
+        )
+        if not source_commit_id:
+            _msg = (
+                "Repository branch '%s' not found or not accessible for "
+                "repository: %s" % (source_repo_branch, source_repo_no_creds)
+            )
+            logger.error(_msg)
+            raise SQAaaSAPIException(422, _msg)
+
+        branch_ref = "refs/heads/%s" % source_repo_branch
+        target_key = hashlib.sha1(target_repo.encode("utf-8")).hexdigest()
+        # Target's branch as last fetched
+        target_tracking_ref = "refs/remotes/%s/%s" % (target_key, source_repo_branch)
+        # Source commit pushed to the target's branch in the last push
+        pushed_ref = "refs/sqaaas/pushed/%s/%s" % (target_key, source_repo_branch)
+
+        if time.monotonic() - self._mirrors_pruned > 86400:
+            self._mirrors_pruned = time.monotonic()
+            GitUtils.prune_mirrors()
+
+        mirror_name = hashlib.sha1(source_repo_no_creds.encode("utf-8")).hexdigest()
+        mirror_path = os.path.join(MIRROR_FOLDER, mirror_name)
+        with GitUtils._get_mirror_lock(mirror_path):
+            repo = GitUtils._get_mirror(source_repo_no_creds, mirror_path)
+            env = self.get_env(MIRROR_FOLDER)
+            target_commit_id = GitUtils.get_commit_from_remote(
+                target_repo, source_repo_branch, env=env
+            )
+            if target_commit_id == source_commit_id or (
+                target_commit_id
+                and GitUtils._is_pushed(
+                    repo,
+                    source_commit_id,
+                    target_repo,
+                    target_commit_id,
+                    (branch_ref, pushed_ref, target_tracking_ref),
+                    env,
+                )
+            ):
+                logger.debug(
+                    "Target repository <%s> (branch: %s) already contains the "
+                    "source commit (%s): nothing to do"
+                    % (target_repo, source_repo_branch, source_commit_id)
+                )
+                return source_repo_branch
+
             try:
-                repo = Repo.clone_from(
-                    source_repo, dirpath, single_branch=True, b=source_repo_branch
+                repo.git.fetch(source_repo, "+%s:%s" % (branch_ref, branch_ref))
+                logger.debug(
+                    "Mirror of repository <%s> updated (branch: %s)"
+                    % (source_repo_no_creds, source_repo_branch)
+                )
+                # Fetching target's branch (only the commits that are not in the
+                # mirror) provides a common base, so that only new objects are pushed
+                if target_commit_id:
+                    repo.git.fetch(
+                        target_repo,
+                        "+%s:%s" % (branch_ref, target_tracking_ref),
+                        env=env,
+                    )
+                repo.git.push(
+                    target_repo,
+                    "+%s:%s" % (branch_ref, branch_ref),
+                    force=True,
+                    env=env,
                 )
+                repo.git.update_ref(pushed_ref, source_commit_id)
             except GitCommandError as e:
                 _msg = GitUtils._custom_exception_messages(
-                    e, repo=source_repo, branch=source_repo_branch
+                    e, repo=source_repo_no_creds, branch=source_repo_branch
                 )
                 logger.error(_msg)
                 raise SQAaaSAPIException(422, _msg)
-            else:
-                self.setup_env(dirpath)
+            logger.debug(
+                "Repository pushed to remote: %s (commit: %s)"
+                % (target_repo, source_commit_id)
+            )
 
-            sqaaas = repo.create_remote(REMOTE_NAME, url=target_repo)
-            sqaaas.push(force=True)
-            logger.debug("Repository pushed to remote: %s" % repo.remotes.sqaaas.url)
-            default_branch = repo.active_branch.name
+        return source_repo_branch
 
-        return default_branch
+    @staticmethod
+    async def run_in_pool(f, *args, **kwargs):
+        """Runs the given (blocking) git work in the git worker pool.
+
+        Returns the value returned by the given callable.
+
+        :param f: callable that carries out the git work
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            git_pool, functools.partial(f, *args, **kwargs)
+        )
 
     @staticmethod
     def do_git_work(f):
@@ -263,6 +546,9 @@ class GitUtils(object):
                         _msg = GitUtils._custom_exception_messages(
                             e, repo=repo_url, branch=source_repo_branch
                         )
+                        _msg = _msg.replace(
+                            source_repo, GitUtils._remove_git_creds(source_repo)
+                        )
                         logger.error(_msg)
                         raise SQAaaSAPIException(422, _msg)
                     else:
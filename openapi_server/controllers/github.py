@@ -3,28 +3,273 @@
 #
 # SPDX-License-Identifier: GPL-3.0-only
 
+import hashlib
 import logging
-
-from github import Github, GithubObject, InputGitTreeElement
-from github.GithubException import GithubException, UnknownObjectException
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from github import Auth, Github, GithubObject, GithubRetry, InputGitTreeElement
+from github.GithubException import (
+    GithubException,
+    RateLimitExceededException,
+    RateLimitExceededExceedsMaxWait,
+    UnknownObjectException,
+)
+from github.NamedUser import NamedUser
+from github.PaginatedList import PaginatedList
 from jinja2 import Environment, PackageLoader
+from openapi_server import config
 from openapi_server.controllers import crypto as crypto_utils
+from openapi_server.controllers.cache import TTLCache
 from openapi_server.exception import SQAaaSAPIException
 
+GITHUB_WORKERS = int(config.get_repo("workers", fallback=4))
+# Text files up to this size (in bytes) are sent within the tree creation request
+INLINE_BLOB_MAX_SIZE = int(config.get_repo("inline_blob_max_size", fallback=102400))
+# Time (in seconds) the repository & organization objects are cached (without
+# being revalidated)
+CACHE_TTL = int(config.get_repo("cache_ttl", fallback=60))
+# Time (in seconds) the metadata of the repositories (description, languages, ..)
+# is cached
+REPO_SETTINGS_CACHE_TTL = int(
+    config.get_repo("repo_settings_cache_ttl", fallback=3600)
+)
+# Maximum number of retries (server errors & short rate-limit waits)
+MAX_RETRIES = int(config.get_repo("max_retries", fallback=10))
+# Maximum time (in seconds) to wait for a rate limit reset before retrying. Waits
+# block the calling (worker) thread, so longer ones make the request fail with
+# RateLimitExceededException instead
+RATE_LIMIT_MAX_WAIT = float(config.get_repo("rate_limit_max_wait", fallback=0))
+# Minimum time (in seconds) between consecutive requests & content-creating requests
+SECONDS_BETWEEN_REQUESTS = float(
+    config.get_repo("seconds_between_requests", fallback=0.25)
+)
+SECONDS_BETWEEN_WRITES = float(config.get_repo("seconds_between_writes", fallback=1.0))
+# Remaining requests (primary rate limit) below which a warning is issued
+QUOTA_WARNING_THRESHOLD = int(config.get_repo("quota_warning_threshold", fallback=500))
+# Remaining requests (primary rate limit) kept for the read requests: content-creating
+# requests are refused below it, so that they are not left half-done
+WRITE_QUOTA_RESERVE = int(config.get_repo("write_quota_reserve", fallback=100))
+
+# Pool of workers for the concurrent (blocking) requests to GitHub API
+github_pool = ThreadPoolExecutor(
+    max_workers=GITHUB_WORKERS, thread_name_prefix="sqaaas-github"
+)
+
+
+class BoundedGithubRetry(GithubRetry):
+    """GithubRetry that does not wait for more than max_rate_limit_wait seconds
+    when the response carries a Retry-After header either."""
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if (
+            retry_after is not None
+            and self.max_rate_limit_wait is not None
+            and retry_after > self.max_rate_limit_wait
+        ):
+            raise RateLimitExceededExceedsMaxWait(
+                response.status,
+                {"message": "Rate limit exceeded"},
+                dict(response.headers),
+                wait=retry_after,
+            )
+        return retry_after
+
 
 class GitHubUtils(object):
     """Class for handling requests to GitHub API.
 
-    Support only for token-based access.
+    Support for token-based access (single token or a pool of tokens) and GitHub
+    App installations.
     """
 
     def __init__(self, access_token):
         """GitHubUtils object definition.
 
-        :param access_token: GitHub's access token
+        :param access_token: GitHub's access token, list of access tokens (pool) or
+            github.Auth object (i.e. AppInstallationAuth)
         """
-        self.client = Github(access_token)
+        if isinstance(access_token, (list, tuple)):
+            auth_list = [Auth.Token(token) for token in access_token]
+        elif isinstance(access_token, str):
+            auth_list = [Auth.Token(access_token)]
+        else:
+            auth_list = [access_token]
+        self.auth_list = auth_list
+        # Rate-limited requests are only retried if the wait requested by GitHub
+        # is short (RATE_LIMIT_MAX_WAIT): otherwise RateLimitExceededException is
+        # raised, and answered with a 503 (see controllers.utils). Content-creating
+        # requests are paced to comply with the secondary rate limits
+        self.clients = [
+            Github(
+                auth=auth,
+                retry=BoundedGithubRetry(
+                    total=MAX_RETRIES, max_rate_limit_wait=RATE_LIMIT_MAX_WAIT
+                ),
+                seconds_between_requests=SECONDS_BETWEEN_REQUESTS,
+                seconds_between_writes=SECONDS_BETWEEN_WRITES,
+            )
+            for auth in auth_list
+        ]
         self.logger = logging.getLogger("sqaaas.api.github")
+        self.org_cache = TTLCache(maxsize=32)
+        self.repo_cache = TTLCache(maxsize=256)
+        self.repo_settings_cache = TTLCache(maxsize=256, ttl=REPO_SETTINGS_CACHE_TTL)
+        # Known blob SHAs of the files, per (repository, branch, path)
+        self.file_sha_cache = TTLCache(maxsize=1024)
+
+    @staticmethod
+    def _get_repo_cache_key(repo_name):
+        """Returns the key of the given repository in the cache.
+
+        :param repo_name: Name of the repo (format: <user|org>/<repo_name>)
+        """
+        _org_name, _repo_name = repo_name.split("/", 1)
+        _repo_name = _repo_name.rsplit("/", 1)[0]  # remove any trailing slash
+        return "/".join([_org_name, _repo_name]).lower()
+
+    def _get_cached(self, cache, key):
+        """Gets an object (Repository, Organization) from the given cache.
+
+        Only the raw data of the objects is cached: the object is rebuilt on top
+        of the client chosen for the current request, so the requests are spread
+        among the clients of the pool.
+
+        Objects cached for more than CACHE_TTL seconds are revalidated with a
+        conditional request (ETag), which does not count against the rate limit
+        when the object has not changed.
+
+        :param cache: TTLCache object
+        :param key: Key of the object in the cache
+        """
+        cached = cache.get(key)
+        if not cached:
+            return None
+        klass, raw_data, raw_headers, validated_at = cached
+        obj = self.client.create_from_raw_data(klass, raw_data, raw_headers)
+        if time.monotonic() - validated_at > CACHE_TTL:
+            try:
+                if obj.update():
+                    self.logger.debug("Cached object <%s> has changed" % key)
+            except UnknownObjectException:
+                cache.pop(key)
+                return None
+            self._set_cached(cache, key, obj)
+        return obj
+
+    @staticmethod
+    def _set_cached(cache, key, obj):
+        """Adds the (raw data of the) object (Repository, Organization) to the
+        given cache.
+
+        :param cache: TTLCache object
+        :param key: Key of the object in the cache
+        :param obj: Object to be cached
+        """
+        cache.set(key, (type(obj), obj.raw_data, obj.raw_headers, time.monotonic()))
+
+    @staticmethod
+    def _get_remaining(client):
+        """Returns the remaining requests of the client, as seen in the last
+        response (None if the client has not been used yet).
+
+        The requester's values are used, since Github.rate_limiting requests them
+        to GitHub when unknown.
+
+        :param client: Github object
+        """
+        remaining = client.requester.rate_limiting[0]
+        return remaining if remaining >= 0 else None
+
+    def _get_client_index(self):
+        """Returns the position, within the pool, of the client with the highest
+        remaining quota (unused clients first)."""
+        if len(self.clients) == 1:
+            return 0
+        return max(
+            range(len(self.clients)),
+            key=lambda index: (
+                self._get_remaining(self.clients[index]) is None,
+                self._get_remaining(self.clients[index]) or 0,
+            ),
+        )
+
+    @property
+    def client(self):
+        """Github client with the highest remaining quota from the pool."""
+        return self.clients[self._get_client_index()]
+
+    def get_access_token(self):
+        """Returns the access token with the highest remaining quota from the pool
+        (for git operations)."""
+        return self.auth_list[self._get_client_index()].token
+
+    def get_quota(self):
+        """Returns the status of the GitHub API's (primary) rate limit, aggregated
+        for all the clients in the pool (None if no client has been used yet).
+
+        Values are obtained from the headers of the last response of each client.
+        """
+        remaining = 0
+        limit = 0
+        reset_list = []
+        for client in self.clients:
+            if self._get_remaining(client) is None:
+                continue
+            _remaining, _limit = client.requester.rate_limiting
+            remaining += _remaining
+            limit += _limit
+            reset_list.append(client.requester.rate_limiting_resettime)
+        if not reset_list:
+            return None
+        quota = {"remaining": remaining, "limit": limit, "reset": min(reset_list)}
+        if remaining < QUOTA_WARNING_THRESHOLD:
+            self.logger.warning(
+                "GitHub API quota running low: %s/%s requests remaining (reset at: "
+                "%s)" % (remaining, limit, quota["reset"])
+            )
+        return quota
+
+    def check_write_quota(self):
+        """Refuses content-creating requests when the client with the highest
+        remaining quota has less than WRITE_QUOTA_RESERVE requests left.
+
+        Raises RateLimitExceededException (answered with a 503, see
+        controllers.utils), with the quota & reset time of that client.
+        """
+        client = self.client
+        remaining = self._get_remaining(client)
+        if remaining is None or remaining >= WRITE_QUOTA_RESERVE:
+            return
+        self.get_quota()
+        limit = client.requester.rate_limiting[1]
+        reset = client.requester.rate_limiting_resettime
+        _reason = (
+            "GitHub API quota too low to push content: %s/%s requests remaining "
+            "(reserve: %s)" % (remaining, limit, WRITE_QUOTA_RESERVE)
+        )
+        self.logger.warning(_reason)
+        raise RateLimitExceededException(
+            403,
+            {"message": _reason},
+            {
+                "x-ratelimit-limit": str(limit),
+                "x-ratelimit-remaining": str(remaining),
+                "x-ratelimit-reset": str(reset),
+            },
+        )
+
+    def get_organization(self, org_name):
+        """Gets the Organization object from GitHub (or the cache, if present).
+
+        :param org_name: Name of the GitHub organization
+        """
+        org = self._get_cached(self.org_cache, org_name.lower())
+        if not org:
+            org = self.client.get_organization(org_name)
+            self._set_cached(self.org_cache, org_name.lower(), org)
+        return org
 
     def _check_repo_args(f):
         def decorated_function(self, *args, **kwargs):
@@ -41,7 +286,7 @@ class GitHubUtils(object):
                 repo = self.get_repository(
                     repo_name, repo_creds=repo_creds, raise_exception=True
                 )
-            f(self, repo)
+            return f(self, repo)
 
         return decorated_function
 
@@ -105,80 +350,235 @@ class GitHubUtils(object):
         :param repo_name: Name of the repo to push (format: <user|org>/<repo_name>)
         :param branch: Branch to push
         """
+        self.check_write_quota()
         repo = self.get_org_repository(repo_name)
         if not branch:
             branch = repo.default_branch
-        contents = self.get_file(file_name, repo_name, branch)
+        _cache_key = (self._get_repo_cache_key(repo_name), branch, file_name)
         r = {}
-        if contents:
-            self.logger.debug(
-                "File <%s> already exists in the repository (branch %s), updating.."
-                % (file_name, branch)
+        file_sha = self.file_sha_cache.get(_cache_key)
+        if file_sha:
+            # Known SHA: no need to fetch the file before updating it
+            try:
+                r = repo.update_file(file_name, commit_msg, file_data, file_sha, branch)
+            except GithubException as e:
+                if e.status not in [404, 409, 422]:
+                    raise e
+                self.logger.debug(
+                    "Cached SHA for file <%s> is outdated (branch %s), refreshing.."
+                    % (file_name, branch)
+                )
+                self.file_sha_cache.pop(_cache_key)
+        if not r:
+            contents = self.get_file(file_name, repo_name, branch)
+            if contents:
+                self.logger.debug(
+                    "File <%s> already exists in the repository (branch %s), updating.."
+                    % (file_name, branch)
+                )
+                r = repo.update_file(
+                    contents.path, commit_msg, file_data, contents.sha, branch
+                )
+            else:
+                self.logger.debug(
+                    "File <%s> does not currently exist in the repository (branch %s), creating.."
+                    % (file_name, branch)
+                )
+                r = repo.create_file(file_name, commit_msg, file_data, branch)
+        self.file_sha_cache.set(_cache_key, r["content"].sha)
+        return r["commit"].sha
+
+    @staticmethod
+    def get_blob_sha(file_data):
+        """Returns the git blob ID (SHA format) of the given content, as computed
+        by git (i.e. 'git hash-object').
+
+        :param file_data: Content of the file
+        """
+        if isinstance(file_data, str):
+            file_data = file_data.encode("utf-8")
+        header = ("blob %s\0" % len(file_data)).encode("utf-8")
+        return hashlib.sha1(header + file_data).hexdigest()
+
+    def _set_file_sha_cache(self, file_list, repo_name, branch):
+        """Records the blob SHAs of the given files as known by the repository.
+
+        :param file_list: List of dicts with the file name (<file_name>), data
+            (<file_data>) and deletion flag (<delete>)
+        :param repo_name: Name of the repo (format: <user|org>/<repo_name>)
+        :param branch: Name of the branch
+        """
+        for file_dict in file_list:
+            _cache_key = (
+                self._get_repo_cache_key(repo_name),
+                branch,
+                file_dict["file_name"],
             )
-            r = repo.update_file(
-                contents.path, commit_msg, file_data, contents.sha, branch
+            if file_dict["delete"]:
+                self.file_sha_cache.pop(_cache_key)
+            else:
+                self.file_sha_cache.set(
+                    _cache_key, self.get_blob_sha(file_dict["file_data"])
+                )
+
+    def get_tree_snapshot(self, repo_name, branch):
+        """Gets a snapshot of the (recursive) git tree of the given branch.
+
+        If the branch does not exist, the snapshot is taken from the default
+        branch.
+
+        Returns a dict with the commit ID (<commit_sha>), the GitTree object
+        (<tree>), the blobs as a {path: (sha, mode)} dict (<blobs>, None if the tree
+        is truncated by GitHub) and whether the branch exists (<branch_exists>).
+
+        :param repo_name: Name of the repo (format: <user|org>/<repo_name>)
+        :param branch: Name of the branch
+        """
+        repo = self.get_org_repository(repo_name)
+        branch_exists = True
+        try:
+            # Avoid GH redirections (such as master to main)
+            branch_data = repo.get_branch(branch)
+            if branch_data.name not in [branch]:
+                raise GithubException("Auto-raised exception")
+            self.logger.debug(
+                "Branch already exists in repo <%s>: %s" % (repo_name, branch)
             )
-        else:
+        except GithubException as e:
+            self.logger.error(e)
             self.logger.debug(
-                "File <%s> does not currently exist in the repository (branch %s), creating.."
-                % (file_name, branch)
+                "Branch does not exist in repo <%s>: %s" % (repo_name, branch)
             )
-            r = repo.create_file(file_name, commit_msg, file_data, branch)
-        return r["commit"].sha
-
-    def push_files(self, file_list, commit_msg, repo_name, branch=GithubObject.NotSet):
+            branch_exists = False
+            branch_data = repo.get_branch(repo.default_branch)
+        commit_sha = branch_data.commit.sha
+        tree = repo.get_git_tree(sha=commit_sha, recursive=True)
+        blobs = None
+        if tree.raw_data.get("truncated", False):
+            self.logger.warning(
+                "Tree of repo <%s> (branch: %s) is truncated by GitHub"
+                % (repo_name, branch)
+            )
+        else:
+            blobs = {
+                element.path: (element.sha, element.mode)
+                for element in tree.tree
+                if element.type in ["blob"]
+            }
+        return {
+            "commit_sha": commit_sha,
+            "tree": tree,
+            "blobs": blobs,
+            "branch_exists": branch_exists,
+        }
+
+    def push_files(
+        self,
+        file_list,
+        commit_msg,
+        repo_name,
+        branch=GithubObject.NotSet,
+        snapshot=None,
+    ):
         """Pushes multiple files into a GitHub repository.
 
-        Returns the commit ID (SHA format).
+        Only the files that differ from the ones in the branch are uploaded. No
+        commit is done if all the files are unchanged.
+
+        Returns a (<commit ID (SHA format)>, <pushed>) tuple. <pushed> is False
+        when no commit was done, the commit ID being the branch's head then.
 
         :param file_list: List of dicts with the file name (<file_name>) and data
             (<file_data>)
         :param commit_msg: Message to use in the commit
         :param repo_name: Name of the repo to push (format: <user|org>/<repo_name>)
         :param branch: Branch to push
+        :param snapshot: Tree snapshot of the branch, as returned by
+            get_tree_snapshot() (taken if not provided)
         """
+        self.check_write_quota()
         repo = self.get_org_repository(repo_name)
+        if not snapshot:
+            snapshot = self.get_tree_snapshot(repo_name, branch)
+        branch_sha = snapshot["commit_sha"]
+        if not snapshot["branch_exists"]:
+            repo.create_git_ref(ref="refs/heads/%s" % branch, sha=branch_sha)
+            self.logger.info("Branch created for repo <%s>: %s" % (repo_name, branch))
+        base_tree = snapshot["tree"]
+        tree_blobs = snapshot["blobs"] or {}
+        if snapshot["blobs"] is None:
+            self.logger.warning(
+                "All files will be uploaded to repo <%s> (branch: %s)"
+                % (repo_name, branch)
+            )
+
         element_list = []
+        files_to_upload = []
         for file_dict in file_list:
             file_name = file_dict["file_name"]
             file_data = file_dict.get("file_data", None)
             to_delete = file_dict["delete"]
             if to_delete:
-                blob_sha = None
+                if tree_blobs and file_name not in tree_blobs:
+                    self.logger.debug(
+                        "File <%s> marked for deletion does not exist: skipping"
+                        % file_name
+                    )
+                    continue
+                element_list.append(
+                    InputGitTreeElement(
+                        path=file_name, mode="100644", type="blob", sha=None
+                    )
+                )
                 self.logger.debug(
                     ("File <%s> marked for deletion in the next " "commit" % file_name)
                 )
             else:
-                blob_sha = repo.create_git_blob(file_data, "utf-8").sha
+                blob_sha = self.get_blob_sha(file_data)
+                if tree_blobs.get(file_name, None) == (blob_sha, "100644"):
+                    self.logger.debug("File <%s> unchanged: skipping" % file_name)
+                    continue
+                if (
+                    isinstance(file_data, str)
+                    and len(file_data.encode("utf-8")) <= INLINE_BLOB_MAX_SIZE
+                ):
+                    # Small text files: content goes inline in the tree
+                    element_list.append(
+                        InputGitTreeElement(
+                            path=file_name,
+                            mode="100644",
+                            type="blob",
+                            content=file_data,
+                        )
+                    )
+                else:
+                    files_to_upload.append((file_name, file_data))
                 self.logger.debug(("File <%s> added for the next commit" % file_name))
+        # Larger files are uploaded as blobs, concurrently
+        blob_sha_list = github_pool.map(
+            lambda file_tuple: repo.create_git_blob(file_tuple[1], "utf-8").sha,
+            files_to_upload,
+        )
+        for (file_name, _), blob_sha in zip(files_to_upload, blob_sha_list):
             element_list.append(
                 InputGitTreeElement(
                     path=file_name, mode="100644", type="blob", sha=blob_sha
                 )
             )
-        try:
-            # Avoid GH redirections (such as master to main)
-            branch_data = repo.get_branch(branch)
-            if branch_data.name not in [branch]:
-                raise GithubException("Auto-raised exception")
-            branch_sha = repo.get_branch(branch).commit.sha
-            self.logger.debug(
-                "Branch already exists in repo <%s>: %s" % (repo_name, branch)
-            )
-        except GithubException as e:
-            self.logger.error(e)
+        if not element_list:
             self.logger.debug(
-                "Branch does not exist in repo <%s>: %s" % (repo_name, branch)
+                "No changes in the files to push to repository <%s> (branch: %s): "
+                "skipping commit" % (repo_name, branch)
             )
-            branch_sha = repo.get_branch(repo.default_branch).commit.sha
-            repo.create_git_ref(ref="refs/heads/%s" % branch, sha=branch_sha)
-            self.logger.info("Branch created for repo <%s>: %s" % (repo_name, branch))
-        base_tree = repo.get_git_tree(sha=branch_sha)
+            self._set_file_sha_cache(file_list, repo_name, branch)
+            return (branch_sha, False)
+
         tree = repo.create_git_tree(element_list, base_tree)
         parent = repo.get_git_commit(sha=branch_sha)
         commit = repo.create_git_commit(commit_msg, tree, [parent])
         branch_refs = repo.get_git_ref("heads/%s" % branch)
         branch_refs.edit(sha=commit.sha)
+        self._set_file_sha_cache(file_list, repo_name, branch)
         self.logger.debug(
             (
                 "Files pushed to remote repository <%s> (branch: %s) with commit "
@@ -186,7 +586,7 @@ class GitHubUtils(object):
             )
         )
 
-        return commit.sha
+        return (commit.sha, True)
 
     def delete_file(self, file_name, repo_name, branch):
         """Pushes a file into GitHub repository.
@@ -202,6 +602,9 @@ class GitHubUtils(object):
         contents = self.get_file(file_name, repo_name, branch)
         if contents:
             repo.delete_file(contents.path, commit_msg, contents.sha, branch)
+            self.file_sha_cache.pop(
+                (self._get_repo_cache_key(repo_name), branch, file_name)
+            )
             self.logger.debug(
                 "File %s deleted from repository <%s>" % (file_name, repo_name)
             )
@@ -215,6 +618,7 @@ class GitHubUtils(object):
         :param branch_name: Name of the branch to create
         :param head_branch_name: Name of the branch to do the checkout from
         """
+        self.check_write_quota()
         repo = self.get_repository(repo_name)
         head_branch = repo.get_branch(head_branch_name)
         repo.create_git_ref(ref="refs/heads/" + branch_name, sha=head_branch.commit.sha)
@@ -233,6 +637,7 @@ class GitHubUtils(object):
         :param org_name: Name of the Github organization to where the repo will be
             forked
         """
+        self.check_write_quota()
         upstream_repo = self.get_repository(upstream_repo_name)
         fork = None
         upstream_org_name = upstream_repo_name.split("/")[0]
@@ -242,7 +647,7 @@ class GitHubUtils(object):
                 "Upstream organization matches the target organization <%s>" % org_name
             )
         else:
-            org = self.client.get_organization(org_name)
+            org = self.get_organization(org_name)
             fork = org.create_fork(upstream_repo)
 
         return fork
@@ -260,6 +665,7 @@ class GitHubUtils(object):
             <user|org>/<repo_name>)
         :param upstream_branch_name: Name of the remote branch to fork
         """
+        self.check_write_quota()
         upstream_repo = self.get_repository(upstream_repo_name)
         if not upstream_branch_name:
             upstream_branch_name = upstream_repo.default_branch
@@ -298,6 +704,35 @@ class GitHubUtils(object):
         )
         return pr.raw_data
 
+    def get_pull_request(self, repo_name, head, pr_number=None):
+        """Gets the open pull request in the given repository whose head matches
+        the given one.
+
+        Returns a PullRequest object, or None if no open pull request was found.
+
+        :param repo_name: Name of the target repository (format:
+            <user|org>/<repo_name>)
+        :param head: Head of the pull request (format: <user|org>:<branch_name>)
+        :param pr_number: Number of a previously created pull request, checked
+            before searching
+        """
+        repo = self.get_repository(repo_name, raise_exception=True)
+        if pr_number:
+            try:
+                pr = repo.get_pull(pr_number)
+            except UnknownObjectException:
+                self.logger.debug(
+                    "Pull request #%s not found in repository <%s>"
+                    % (pr_number, repo_name)
+                )
+            else:
+                if pr.state in ["open"] and pr.head.label.lower() == head.lower():
+                    return pr
+        # Filtered by GitHub (only one page is needed)
+        for pr in repo.get_pulls(state="open", head=head):
+            return pr
+        return None
+
     def get_branch(self, repo_name, branch_name):
         """Look for a a branch in the given Github repository.
 
@@ -326,6 +761,7 @@ class GitHubUtils(object):
             be raised
         """
         _client = None
+        _cache_key = self._get_repo_cache_key(repo_name)
         if repo_creds:
             _user_id = repo_creds.get("user_id", "")
             _user_id_decrypted = crypto_utils.decrypt_str(_user_id)
@@ -334,10 +770,16 @@ class GitHubUtils(object):
             _client = Github(_user_id_decrypted, _token_decrypted)
         else:
             _client = self.client
+            repo = self._get_cached(self.repo_cache, _cache_key)
+            if repo:
+                self.logger.debug("Repository <%s> found (cached)" % repo_name)
+                return repo
 
         repo = False
         try:
             repo = _client.get_repo(repo_name)
+            if not repo_creds:
+                self._set_cached(self.repo_cache, _cache_key, repo)
         except UnknownObjectException as e:
             _reason = "Github exception: %s" % e
             self.logger.error(_reason)
@@ -371,17 +813,24 @@ class GitHubUtils(object):
     def get_org_repository(self, repo_name, org_name="eosc-synergy"):
         """Gets a repository from the given Github organization.
 
-        If found, it returns the repo object, otherwise False
+        If found, it returns the repo object, otherwise False. Repository objects
+        are cached, and revalidated after CACHE_TTL seconds.
 
         :param repo_name: Name of the repo (format: <user|org>/<repo_name>)
         """
+        _cache_key = self._get_repo_cache_key(repo_name)
+        repo = self._get_cached(self.repo_cache, _cache_key)
+        if repo:
+            return repo
         _org_name, _repo_name = repo_name.split("/", 1)
         _repo_name = _repo_name.rsplit("/", 1)[0]  # remove any trailing slash
-        org = self.client.get_organization(_org_name)
+        org = self.get_organization(_org_name)
         try:
-            return org.get_repo(_repo_name)
+            repo = org.get_repo(_repo_name)
         except UnknownObjectException:
             return False
+        self._set_cached(self.repo_cache, _cache_key, repo)
+        return repo
 
     def create_org_repository(
         self, repo_name, branch=GithubObject.NotSet, include_readme=True
@@ -394,14 +843,16 @@ class GitHubUtils(object):
         :param branch: Name of the branch
         :param include_readme: Whether to include README from template
         """
+        self.check_write_quota()
         _org_name, _repo_name = repo_name.split("/", 1)
         _repo_name = _repo_name.rsplit("/", 1)[0]  # remove any trailing slash
         repo = self.get_org_repository(repo_name)
         # Create repo
         if not repo:
             self.logger.debug("GitHub repository does not exist: %s" % repo_name)
-            org = self.client.get_organization(_org_name)
+            org = self.get_organization(_org_name)
             repo = org.create_repo(_repo_name)
+            self._set_cached(self.repo_cache, self._get_repo_cache_key(repo_name), repo)
             self.logger.debug("Created new GitHub repository: %s" % repo_name)
         else:
             self.logger.debug("GitHub repository already exists: %s" % repo_name)
@@ -424,6 +875,7 @@ class GitHubUtils(object):
         repo = self.get_org_repository(repo_name)
         self.logger.debug("Deleting repository: %s" % repo_name)
         repo.delete()
+        self.repo_cache.pop(self._get_repo_cache_key(repo_name))
         self.logger.debug("Repository <%s> successfully deleted" % repo_name)
 
     def get_commit_url(self, repo_name, commit_id):
@@ -478,6 +930,9 @@ class GitHubUtils(object):
     def get_watchers(self, repo=None, repo_name=None, repo_creds={}):
         """Gets the watcher count from a Github repository.
 
+        NOTE GitHub API's /watchers endpoint returns the stargazers (the actual
+        watchers are the subscribers).
+
         :param repo: Repository object
         :param repo_name: Name of the repo to push (format: <user|org>/<repo_name>)
         """
@@ -501,6 +956,125 @@ class GitHubUtils(object):
         """
         return repo.get_forks().totalCount
 
+    def get_repo_settings(self, repo_name, repo_creds={}):
+        """Gets the metadata of a Github repository (as required by the
+        assessment's repo_settings).
+
+        Metadata is obtained through a single GraphQL query (plus the contributor
+        count from the REST API) and cached for REPO_SETTINGS_CACHE_TTL seconds.
+        Falls back to REST API requests when credentials are provided or the
+        GraphQL query fails.
+
+        Returns a dict with the avatar URL, description, languages, topics and the
+        stargazers, watchers, contributors & forks count.
+
+        :param repo_name: Name of the repo (format: <user|org>/<repo_name>)
+        :param repo_creds: Credentials needed for successful authentication
+        """
+        _cache_key = self._get_repo_cache_key(repo_name)
+        if not repo_creds:
+            repo_settings = self.repo_settings_cache.get(_cache_key)
+            if repo_settings:
+                self.logger.debug(
+                    "Using cached settings for repository <%s>" % repo_name
+                )
+                return repo_settings
+            try:
+                repo_settings = self._get_repo_settings_graphql(repo_name)
+            except UnknownObjectException as e:
+                _reason = "Github exception: %s" % e
+                self.logger.error(_reason)
+                raise SQAaaSAPIException(422, _reason)
+            except GithubException as e:
+                self.logger.warning(
+                    "Could not get settings for repository <%s> through GraphQL "
+                    "(falling back to REST API): %s" % (repo_name, e)
+                )
+                repo_settings = self._get_repo_settings_rest(repo_name)
+            self.repo_settings_cache.set(_cache_key, repo_settings)
+        else:
+            repo_settings = self._get_repo_settings_rest(repo_name, repo_creds)
+
+        return repo_settings
+
+    def _get_repo_settings_graphql(self, repo_name):
+        """Gets the metadata of a Github repository through the GraphQL API.
+
+        :param repo_name: Name of the repo (format: <user|org>/<repo_name>)
+        """
+        query = """
+        query($owner: String!, $name: String!) {
+          repository(owner: $owner, name: $name) {
+            description
+            owner { avatarUrl }
+            languages(first: 100, orderBy: {field: SIZE, direction: DESC}) {
+              nodes { name }
+            }
+            repositoryTopics(first: 100) { nodes { topic { name } } }
+            stargazerCount
+            forkCount
+          }
+        }
+        """
+        _owner_name, _repo_name = self._get_repo_cache_key(repo_name).split("/", 1)
+        client = self.client
+        headers, data = client.requester.graphql_query(
+            query, {"owner": _owner_name, "name": _repo_name}
+        )
+        repo_data = data["data"]["repository"]
+        # NOTE watchers_count keeps the value returned by the REST API (see
+        # get_watchers()), which corresponds to the stargazers
+        # Contributors are not available in GraphQL API (count from pagination)
+        contributors = PaginatedList(
+            NamedUser,
+            client.requester,
+            "/repos/%s/%s/contributors" % (_owner_name, _repo_name),
+            None,
+        )
+        self.logger.debug("Repository <%s> settings fetched (GraphQL)" % repo_name)
+        return {
+            "avatar_url": repo_data["owner"]["avatarUrl"],
+            "description": repo_data["description"],
+            "languages": [node["name"] for node in repo_data["languages"]["nodes"]],
+            "topics": [
+                node["topic"]["name"] for node in repo_data["repositoryTopics"]["nodes"]
+            ],
+            "stargazers_count": repo_data["stargazerCount"],
+            "watchers_count": repo_data["stargazerCount"],
+            "contributors_count": contributors.totalCount,
+            "forks_count": repo_data["forkCount"],
+        }
+
+    def _get_repo_settings_rest(self, repo_name, repo_creds={}):
+        """Gets the metadata of a Github repository through (concurrent) REST API
+        requests.
+
+        :param repo_name: Name of the repo (format: <user|org>/<repo_name>)
+        :param repo_creds: Credentials needed for successful authentication
+        """
+        repo = self.get_repository(
+            repo_name, repo_creds=repo_creds, raise_exception=True
+        )
+        getters = {
+            "languages": self.get_languages,
+            "topics": self.get_topics,
+            "stargazers_count": self.get_stargazers,
+            "watchers_count": self.get_watchers,
+            "contributors_count": self.get_contributors,
+            "forks_count": self.get_forks,
+        }
+        futures = {
+            key: github_pool.submit(getter, repo=repo)
+            for key, getter in getters.items()
+        }
+        repo_settings = {
+            "avatar_url": repo.owner.avatar_url,
+            "description": repo.description,
+        }
+        repo_settings.update({key: future.result() for key, future in futures.items()})
+        self.logger.debug("Repository <%s> settings fetched (REST)" % repo_name)
+        return repo_settings
+
     def get_avatar(self, repo_name, repo_creds={}):
         """Gets the avatar URL from a Github repository.
 
@@ -0,0 +1,52 @@
+# SPDX-FileCopyrightText: Copyright contributors to the Software Quality Assurance as a Service (SQAaaS) project <sqaaas@ibergrid.eu>
+#
+# SPDX-License-Identifier: GPL-3.0-only
+
+import logging
+
+import aiohttp
+from openapi_server import config
+
+logger = logging.getLogger("sqaaas.api.http")
+
+# Timeout (in seconds) of the requests to the upstream services
+HTTP_TIMEOUT = float(config.get("http_timeout", fallback=60))
+# Maximum number of simultaneous connections (total and per host)
+HTTP_POOL_SIZE = int(config.get("http_pool_size", fallback=100))
+HTTP_POOL_SIZE_PER_HOST = int(config.get("http_pool_size_per_host", fallback=10))
+
+_session = None
+
+
+def get_session():
+    """Returns the HTTP client session shared by the requests to the upstream
+    services (Jenkins, Badgr).
+
+    The session keeps the connections alive (pooled) and is created on first use,
+    since it must be bound to the running event loop.
+    """
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_POOL_SIZE, limit_per_host=HTTP_POOL_SIZE_PER_HOST
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector, timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT)
+        )
+        logger.debug(
+            "HTTP client session created (pool size: %s, per host: %s)"
+            % (HTTP_POOL_SIZE, HTTP_POOL_SIZE_PER_HOST)
+        )
+    return _session
+
+
+async def close_session(app=None):
+    """Closes the shared HTTP client session (if any).
+
+    :param app: aiohttp application (when used as a cleanup signal handler)
+    """
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+        logger.debug("HTTP client session closed")
+    _session = None
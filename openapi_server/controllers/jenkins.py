@@ -3,19 +3,132 @@
 #
 # SPDX-License-Identifier: GPL-3.0-only
 
+import asyncio
+import codecs
+import gzip
+import hashlib
+import json
 import logging
-from urllib.parse import quote_plus, urljoin
-
+import os
+import shutil
+import tempfile
+import threading
+import time
+from html.parser import HTMLParser
+from urllib.parse import quote, quote_plus, unquote, urljoin, urlparse
+
+import aiohttp
 import jenkins
 import requests
-from bs4 import BeautifulSoup
 from jinja2 import Environment, PackageLoader
+from openapi_server import config
+from openapi_server.controllers import http_client
+from openapi_server.controllers.cache import TTLCache
 from openapi_server.exception import SQAaaSAPIException
 
 CREATE_CREDENTIAL_ORG = (
     "/job/%(folder_name)s/credentials/store/folder/"
     "domain/%(domain_name)s/createCredentials"
 )
+# Fields requested to Jenkins (tree parameter) when getting job & build info
+JOB_INFO_TREE = "fullName,lastBuild[number,url],builds[number]{0,1}"
+BUILD_INFO_TREE = "number,url,result,queueId"
+FOLDER_BUILDS_TREE = "jobs[name,jobs[name,builds[number,url,result,queueId]{0,%s}]]"
+# Pipeline run (Stage View API) status to build result mapping. Statuses not in
+# the map (e.g. IN_PROGRESS) correspond to running builds
+STAGE_VIEW_RESULTS = {
+    "SUCCESS": "SUCCESS",
+    "UNSTABLE": "UNSTABLE",
+    "FAILED": "FAILURE",
+    "ABORTED": "ABORTED",
+    "NOT_EXECUTED": "NOT_BUILT",
+}
+# Maximum number of pipeline stages whose data is fetched concurrently
+STAGE_DATA_WORKERS = int(config.get_ci("stage_data_workers", fallback=5))
+# Path to keep the (compressed) stage data of the finished builds
+STAGE_DATA_CACHE_FOLDER = config.get_ci(
+    "stage_data_cache_folder",
+    fallback=os.path.join(
+        os.path.dirname(config.get("db_file", fallback="/sqaaas/sqaaas.json")),
+        "stage_data",
+    ),
+)
+# Time (in days) the cached stage data is kept. Older files are pruned, at most
+# once a day, when new stage data is cached
+STAGE_DATA_CACHE_MAX_AGE = float(config.get_ci("stage_data_cache_max_age", fallback=30))
+# Size (in bytes) of the chunks read when streaming the console output
+CONSOLE_CHUNK_SIZE = 64 * 1024
+# Time (in seconds) the job names of a Jenkins folder are considered up to date
+JOB_INDEX_TTL = int(config.get_ci("job_index_ttl", fallback=300))
+# Minimum time (in seconds) between organization scans. Scan requests received
+# meanwhile are coalesced into a single scan
+SCAN_ORGANIZATION_INTERVAL = float(
+    config.get_ci("scan_organization_interval", fallback=30)
+)
+# Time (in seconds) between the checks for the jobs created by a scan, and
+# maximum time to wait for them
+JOB_WAIT_INTERVAL = float(config.get_ci("job_wait_interval", fallback=10))
+JOB_WAIT_TIMEOUT = float(config.get_ci("job_wait_timeout", fallback=600))
+
+
+class ConsoleOutputParser(HTMLParser):
+    """Streaming parser that extracts the text from the (first) <pre
+    class="console-output"> tag of a Jenkins console page.
+
+    The command (first line) is split from the output as the text is fed, without
+    building the document tree.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tag_count = 0
+        self._depth = 0
+        self._cmd = []
+        self._cmd_done = False
+        self._output = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag != "pre":
+            return
+        if self._depth:
+            self._depth += 1
+            return
+        if "console-output" in (dict(attrs).get("class", None) or "").split():
+            self.tag_count += 1
+            if self.tag_count == 1:
+                self._depth = 1
+
+    def handle_endtag(self, tag):
+        if tag == "pre" and self._depth:
+            self._depth -= 1
+
+    def handle_data(self, data):
+        if not self._depth:
+            return
+        if self._cmd_done:
+            self._output.append(data)
+            return
+        if not self._cmd:
+            data = data.lstrip()
+            if not data:
+                return
+        cmd, newline, output = data.partition("\n")
+        self._cmd.append(cmd)
+        if newline:
+            self._cmd_done = True
+            self._output.append(output)
+
+    def get_output(self):
+        """Returns a (<command>, <output text>) tuple. Command is empty if the
+        first line of the console output is not a command ('+' prefix)."""
+        cmd = "".join(self._cmd)
+        output_text = "".join(self._output).rstrip()
+        if not output_text:
+            cmd = cmd.rstrip()
+        if not cmd.startswith("+"):
+            output_text = "\n".join([cmd, output_text]) if output_text else cmd
+            cmd = ""
+        return (cmd, output_text)
 
 
 class JenkinsUtils(object):
@@ -37,7 +150,17 @@ class JenkinsUtils(object):
         self.server = jenkins.Jenkins(
             self.endpoint, username=self.access_user, password=self.access_token
         )
+        self.auth = aiohttp.BasicAuth(self.access_user, self.access_token)
         self.logger = logging.getLogger("sqaaas.api.jenkins")
+        # Job names per folder: {<folder>: {<lower-case job name>: <job name>}}
+        self.job_index = TTLCache(ttl=JOB_INDEX_TTL)
+        self._job_index_lock = threading.Lock()
+        # Organization scans: {<org>: {"last": <time>, "pending": <task>}}
+        self._scans = {}
+        # Jobs being waited for: {<folder>: {(<repo>, <branch>): [<futures>]}}
+        self._job_waiters = {}
+        self._job_watchers = {}
+        self._stage_data_pruned = 0
 
     @staticmethod
     def format_job_name(job_name):
@@ -49,41 +172,293 @@ class JenkinsUtils(object):
         """
         return quote_plus(job_name.replace("/", "%2F"))
 
-    def scan_organization(self, org_name="eosc-synergy-org"):
-        path = "/job/%s/build?delay=0" % org_name
-        r = requests.post(
-            urljoin(self.endpoint, path), auth=(self.access_user, self.access_token)
-        )
-        if not r.ok:
-            self.logger.error(
-                "Could not trigger SCAN_ORGANIZATION in Jenkins endpoint: %s"
-                % self.endpoint
-            )
-        else:
+    async def scan_organization(self, org_name="eosc-synergy-org"):
+        """Triggers the scan of the GitHub organization in Jenkins.
+
+        Scans are triggered at most once every SCAN_ORGANIZATION_INTERVAL
+        seconds: the requests received meanwhile share the next scan, which is
+        scheduled in the background. Only an immediate scan is waited for.
+
+        :param org_name: Name of the Jenkins organization folder
+        """
+        scan_data = self._scans.setdefault(org_name, {"last": 0, "pending": None})
+        if scan_data["pending"] is not None:
             self.logger.debug(
-                "Triggered SCAN_ORGANIZATION in Jenkins endpoint: %s" % self.endpoint
+                "SCAN_ORGANIZATION request coalesced with the pending scan of "
+                "<%s>" % org_name
             )
-        r.raise_for_status()
+            return
+        delay = scan_data["last"] + SCAN_ORGANIZATION_INTERVAL - time.monotonic()
+        scan_task = asyncio.ensure_future(
+            self._scan_organization(org_name, max(delay, 0))
+        )
+        scan_task.add_done_callback(self._log_scan_organization_error)
+        scan_data["pending"] = scan_task
+        if delay <= 0:
+            # Shielded so that a cancelled request does not cancel the scan
+            await asyncio.shield(scan_task)
+
+    def _log_scan_organization_error(self, scan_task):
+        if not scan_task.cancelled() and scan_task.exception():
+            self.logger.error("SCAN_ORGANIZATION failed: %s" % scan_task.exception())
+
+    async def _scan_organization(self, org_name, delay):
+        scan_data = self._scans[org_name]
+        try:
+            if delay:
+                self.logger.debug(
+                    "Delaying SCAN_ORGANIZATION of <%s> for %.1f seconds"
+                    % (org_name, delay)
+                )
+                await asyncio.sleep(delay)
+        finally:
+            # Requests from now on are served by a new scan
+            scan_data["pending"] = None
+            scan_data["last"] = time.monotonic()
+        path = "/job/%s/build?delay=0" % org_name
+        session = http_client.get_session()
+        async with session.post(urljoin(self.endpoint, path), auth=self.auth) as r:
+            if not r.ok:
+                self.logger.error(
+                    "Could not trigger SCAN_ORGANIZATION in Jenkins endpoint: %s"
+                    % self.endpoint
+                )
+            else:
+                self.logger.debug(
+                    "Triggered SCAN_ORGANIZATION in Jenkins endpoint: %s"
+                    % self.endpoint
+                )
+            r.raise_for_status()
         self.logger.debug("Triggered GitHub organization scan")
 
-    def get_job_info(self, name, depth=0):
-        job_info = {}
-        job_name_list = []
+    async def wait_for_job(self, job_name, timeout=JOB_WAIT_TIMEOUT):
+        """Waits until the given job is created in Jenkins (e.g. by an
+        organization scan). Returns True if the job was found within the
+        timeout.
+
+        The jobs of a folder are checked with a single request, regardless of
+        the number of jobs being waited for.
 
+        :param job_name: job name including folder, name & branch
+        :param timeout: Maximum time (in seconds) to wait for the job
+        """
+        _org, _repo, _branch = self.normalize_job_name(job_name)
+        folder_name = job_name.split("/")[0]
+        future = asyncio.get_running_loop().create_future()
+        waiters = self._job_waiters.setdefault(folder_name, {})
+        waiters.setdefault((_repo, _branch), []).append(future)
+        if folder_name not in self._job_watchers:
+            self._job_watchers[folder_name] = asyncio.create_task(
+                self._watch_folder_jobs(folder_name)
+            )
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self.logger.warning(
+                "Timeout while waiting for the creation of job <%s>" % job_name
+            )
+            return False
+        finally:
+            job_waiters = waiters.get((_repo, _branch), [])
+            if future in job_waiters:
+                job_waiters.remove(future)
+            if not job_waiters:
+                waiters.pop((_repo, _branch), None)
+
+    def _get_folder_branches(self, folder_name):
+        folder_data = self._get_json(
+            "/job/%s" % quote(folder_name), tree="jobs[name,jobs[name]]"
+        )
+        job_names = {}
+        branches = set()
+        for job in folder_data.get("jobs", []):
+            job_names[job["name"].lower()] = job["name"]
+            for branch in job.get("jobs", []):
+                branches.add(
+                    (
+                        self.normalize_job_name(job["name"])[0],
+                        self.normalize_job_name(branch["name"])[0],
+                    )
+                )
+        self.job_index.set(folder_name, job_names)
+        return branches
+
+    async def _watch_folder_jobs(self, folder_name):
+        waiters = self._job_waiters[folder_name]
+        try:
+            while waiters:
+                try:
+                    branches = await asyncio.to_thread(
+                        self._get_folder_branches, folder_name
+                    )
+                except Exception as e:
+                    # Keep polling: the waiters time out on their own
+                    self.logger.error(
+                        "Could not get the jobs for Jenkins folder <%s>: %s"
+                        % (folder_name, str(e))
+                    )
+                    branches = set()
+                for job_key in list(waiters):
+                    if job_key in branches:
+                        for future in waiters.pop(job_key):
+                            if not future.done():
+                                future.set_result(True)
+                        self.logger.debug(
+                            "Job <%s> found in Jenkins folder <%s>"
+                            % ("/".join(job_key), folder_name)
+                        )
+                if waiters:
+                    await asyncio.sleep(JOB_WAIT_INTERVAL)
+        finally:
+            self._job_watchers.pop(folder_name, None)
+
+    @staticmethod
+    def get_job_path(job_name):
+        """Returns the URL path of the given job.
+
+        :param job_name: job name including folder/s, name & branch
+        """
+        return "/job/" + "/job/".join([quote(item) for item in job_name.split("/")])
+
+    @staticmethod
+    def get_job_name_from_path(job_path):
+        """Returns the job name (folder/s, name & branch) from the URL (or URL
+        path) of the job.
+
+        :param job_path: URL or URL path of the job
+        """
+        items = urlparse(job_path).path.strip("/").split("/")
+        if "job" in items:
+            items = items[items.index("job") :]
+        return "/".join([unquote(item) for item in items[1::2]])
+
+    @staticmethod
+    def normalize_job_name(job_name):
+        """Returns a comparable version of the job name.
+
+        Job name items are fully unquoted and lower-cased, as Jenkins' org-folder
+        matching is case-insensitive.
+
+        :param job_name: job name including folder/s, name & branch
+        """
+        items = []
+        for item in job_name.split("/"):
+            while unquote(item) != item:
+                item = unquote(item)
+            items.append(item.lower())
+        return items
+
+    def _get_json(self, path, tree=None, api_path="api/json"):
+        """Performs a GET request to the Jenkins JSON API.
+
+        :param path: Path of the Jenkins object
+        :param tree: Value of the 'tree' parameter, to limit the fields returned
+        :param api_path: Path of the API endpoint, relative to the object's
+        """
+        url = urljoin(self.endpoint, "%s/%s" % (path.rstrip("/"), api_path))
+        if tree:
+            url += "?tree=%s" % quote(tree)
+        try:
+            response = self.server.jenkins_open(requests.Request("GET", url))
+            return json.loads(response)
+        except requests.exceptions.HTTPError as e:
+            raise jenkins.JenkinsException("Request to <%s> failed: %s" % (url, e))
+        except ValueError:
+            raise jenkins.JenkinsException("Could not parse JSON from <%s>" % url)
+
+    def _get_folder_jobs(self, folder_name, refresh=False):
+        """Returns the job names within the given folder, indexed by their
+        lower-case version.
+
+        The index is refreshed on a per-folder basis, fetching only the names of
+        the jobs.
+
+        :param folder_name: Name of the Jenkins folder
+        :param refresh: Forces to fetch the job names from Jenkins
+        """
+        job_names = None
+        if not refresh:
+            job_names = self.job_index.get(folder_name)
+        if job_names is None:
+            with self._job_index_lock:
+                try:
+                    folder_data = self._get_json(
+                        "/job/%s" % quote(folder_name), tree="jobs[name]"
+                    )
+                except jenkins.JenkinsException as e:
+                    self.logger.error(
+                        "Could not get the jobs for Jenkins folder <%s>: %s"
+                        % (folder_name, str(e))
+                    )
+                    return {}
+                job_names = {
+                    job["name"].lower(): job["name"]
+                    for job in folder_data.get("jobs", [])
+                }
+                self.job_index.set(folder_name, job_names)
+                self.logger.debug(
+                    "Job index for Jenkins folder <%s> refreshed (%s jobs)"
+                    % (folder_name, len(job_names))
+                )
+        return job_names
+
+    def get_folder_builds(self, folder_name, build_limit=5):
+        """Returns the latest builds of all the jobs (branches) within the given
+        folder, indexed by the normalized job name.
+
+        A single request is done for the whole folder. The job index of the
+        folder is refreshed as well.
+
+        :param folder_name: Name of the Jenkins folder
+        :param build_limit: Maximum number of builds returned per job
+        """
+        folder_data = self._get_json(
+            "/job/%s" % quote(folder_name), tree=FOLDER_BUILDS_TREE % build_limit
+        )
+        job_names = {}
+        folder_builds = {}
+        for job in folder_data.get("jobs", []):
+            job_names[job["name"].lower()] = job["name"]
+            for branch_job in job.get("jobs", []):
+                job_name = "/".join([folder_name, job["name"], branch_job["name"]])
+                folder_builds[tuple(self.normalize_job_name(job_name))] = (
+                    branch_job.get("builds", [])
+                )
+        self.job_index.set(folder_name, job_names)
+        self.logger.debug(
+            "Builds obtained for %s job/s in Jenkins folder <%s>"
+            % (len(folder_builds), folder_name)
+        )
+        return folder_builds
+
+    def get_job_name(self, name):
+        """Returns the name of the job as known by Jenkins.
+
+        Matching is case-insensitive (Jenkins org-folder limitation).
+
+        :param name: job name including folder, name & branch
+        """
         _org, _repo, _branch = name.split("/")
-        for folder in self.server.get_jobs(folder_depth=1):
-            if folder["name"] in [_org]:
-                job_name_list = [job["name"] for job in folder["jobs"]]
-        # Try case-insensitive (Jenkins org-folder limitation)
-        if _repo not in job_name_list:
-            self.logger.debug("Trying case-insensitive match with job: <%s>" % name)
-            for job_name in job_name_list:
-                if _repo.lower() in [job_name.lower()]:
-                    name = "/".join([_org, job_name, _branch])
-                    self.logger.debug("Using new job name: <%s>" % name)
-                    break
+        job_names = self._get_folder_jobs(_org)
+        if _repo.lower() not in job_names:
+            # Job might have been created after the last index refresh
+            job_names = self._get_folder_jobs(_org, refresh=True)
+        job_repo = job_names.get(_repo.lower(), _repo)
+        if job_repo != _repo:
+            name = "/".join([_org, job_repo, _branch])
+            self.logger.debug("Using new job name: <%s>" % name)
+        return name
+
+    def get_job_info(self, name, tree=JOB_INFO_TREE):
+        """Get the information of the job, limited to the fields in tree.
+
+        :param name: job name including folder, name & branch
+        :param tree: Fields to be requested (all of them if None)
+        """
+        job_info = {}
+        name = self.get_job_name(name)
         try:
-            job_info = self.server.get_job_info(name, depth=depth)
+            job_info = self._get_json(self.get_job_path(name), tree=tree)
             self.logger.debug(
                 "Information for job <%s> obtained from Jenkins: %s" % (name, job_info)
             )
@@ -99,7 +474,7 @@ class JenkinsUtils(object):
 
         :param job_name: job name including folder/s, name & branch
         """
-        return self.get_job_info(job_name)
+        return self.get_job_info(job_name, tree="name")
 
     def build_job(self, full_job_name):
         """Build existing job.
@@ -135,14 +510,20 @@ class JenkinsUtils(object):
                 )
         return executable_data
 
-    def get_build_info(self, full_job_name, build_no, depth=0):
+    def get_build_info(self, full_job_name, build_no, tree=BUILD_INFO_TREE):
+        """Get the information of the build, limited to the fields in tree.
+
+        :param full_job_name: job name including folder/s, name & branch
+        :param build_no: build number.
+        :param tree: Fields to be requested (all of them if None)
+        """
         self.logger.debug(
             "Getting status for job <%s> (build_no: %s)" % (full_job_name, build_no)
         )
         build_info = None
         try:
-            build_info = self.server.get_build_info(
-                full_job_name, build_no, depth=depth
+            build_info = self._get_json(
+                "%s/%s" % (self.get_job_path(full_job_name), build_no), tree=tree
             )
             self.logger.debug("Build info as obtained by Jenkins: %s" % build_info)
         except Exception:
@@ -166,9 +547,157 @@ class JenkinsUtils(object):
     def delete_job(self, full_job_name):
         self.logger.debug("Deleting Jenkins job: %s" % full_job_name)
         self.server.delete_job(full_job_name)
+        self.job_index.pop(full_job_name.split("/")[0])
+        # Build numbers start over if a job with the same name is created again
+        shutil.rmtree(
+            self._get_stage_data_cache_folder(full_job_name), ignore_errors=True
+        )
         self.logger.debug("Jenkins job <%s> successfully deleted" % full_job_name)
 
-    def get_stage_data(self, job_name, build_no):
+    async def get_progressive_text(self, job_name, build_no, start, callback):
+        """Gets the console log text of the build from the given offset (progressive
+        text API), passing it to the callback as it is received.
+
+        Returns a (<next offset>, <more data>) tuple, where <more data> is True
+        while the build is running.
+
+        :param job_name: job name including folder/s, name & branch
+        :param build_no: build number.
+        :param start: Offset (in bytes) of the log text
+        :param callback: Coroutine function that receives the log text
+        """
+        path = "%s/%s/logText/progressiveText?start=%s" % (
+            self.get_job_path(job_name),
+            build_no,
+            start,
+        )
+        session = http_client.get_session()
+        async with session.get(
+            urljoin(self.endpoint, path), auth=self.auth, ssl=False
+        ) as r:
+            r.raise_for_status()
+            decoder = codecs.getincrementaldecoder(r.charset or "utf-8")(
+                errors="replace"
+            )
+            async for chunk in r.content.iter_chunked(CONSOLE_CHUNK_SIZE):
+                text = decoder.decode(chunk)
+                if text:
+                    await callback(text)
+            text = decoder.decode(b"", final=True)
+            if text:
+                await callback(text)
+            next_start = int(r.headers.get("X-Text-Size", start))
+            more_data = r.headers.get("X-More-Data", "").lower() == "true"
+        return (next_start, more_data)
+
+    def _get_stage_data_cache_folder(self, job_name):
+        """Returns the path of the folder that keeps the stage data of the job.
+
+        :param job_name: job name including folder/s, name & branch
+        """
+        job_key = hashlib.sha1(
+            "/".join(self.normalize_job_name(job_name)).encode("utf-8")
+        ).hexdigest()
+        return os.path.join(STAGE_DATA_CACHE_FOLDER, job_key)
+
+    def _get_stage_data_cache_file(self, job_name, build_no, build_id):
+        """Returns the path of the file that keeps the stage data of the build.
+
+        :param job_name: job name including folder/s, name & branch
+        :param build_no: build number.
+        :param build_id: Identity of the build (e.g. queue ID)
+        """
+        return os.path.join(
+            self._get_stage_data_cache_folder(job_name),
+            "%s-%s.json.gz" % (build_no, build_id),
+        )
+
+    def prune_stage_data_cache(self, max_age=STAGE_DATA_CACHE_MAX_AGE):
+        """Removes the cached stage data older than the given age, and the job
+        folders left empty.
+
+        :param max_age: Maximum age (in days) of the cached stage data
+        """
+        expiry = time.time() - max_age * 86400
+        removed = 0
+        try:
+            job_folders = list(os.scandir(STAGE_DATA_CACHE_FOLDER))
+        except FileNotFoundError:
+            return 0
+        for job_folder in job_folders:
+            if not job_folder.is_dir():
+                continue
+            try:
+                for cache_file in os.scandir(job_folder.path):
+                    if cache_file.stat().st_mtime < expiry:
+                        os.remove(cache_file.path)
+                        removed += 1
+                os.rmdir(job_folder.path)
+            except OSError:
+                # Folder not empty, or concurrently modified
+                pass
+        self.logger.debug("Pruned %s stage data cache file/s" % removed)
+        return removed
+
+    def get_cached_stage_data(self, job_name, build_no, build_id):
+        """Returns the stage data of a finished build from the cache (None if not
+        cached).
+
+        :param job_name: job name including folder/s, name & branch
+        :param build_no: build number.
+        :param build_id: Identity of the build (e.g. queue ID)
+        """
+        cache_file = self._get_stage_data_cache_file(job_name, build_no, build_id)
+        try:
+            with gzip.open(cache_file, "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self.logger.warning(
+                "Discarding stage data cache file <%s>: %s" % (cache_file, e)
+            )
+            return None
+
+    def set_cached_stage_data(self, job_name, build_no, build_id, stage_data_list):
+        """Stores the stage data of a finished build in the cache.
+
+        :param job_name: job name including folder/s, name & branch
+        :param build_no: build number.
+        :param build_id: Identity of the build (e.g. queue ID)
+        :param stage_data_list: List of stage data
+        """
+        if time.monotonic() - self._stage_data_pruned > 86400:
+            self._stage_data_pruned = time.monotonic()
+            self.prune_stage_data_cache()
+        cache_file = self._get_stage_data_cache_file(job_name, build_no, build_id)
+        cache_folder = os.path.dirname(cache_file)
+        os.makedirs(cache_folder, exist_ok=True)
+        fd, tmp_file = tempfile.mkstemp(dir=cache_folder, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(gzip.compress(json.dumps(stage_data_list).encode("utf-8")))
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            self.logger.warning(
+                "Could not store stage data cache file <%s>: %s" % (cache_file, e)
+            )
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+        else:
+            self.logger.debug(
+                "Stage data for job <%s> (build no: %s) cached"
+                % (job_name, build_no)
+            )
+
+    async def get_stage_data(
+        self,
+        job_name,
+        build_no,
+        finished_only=False,
+        exclude_stages=None,
+        build_id=None,
+    ):
         """Get the info from the pipeline stages.
 
         Via Pipeline Stage View API at
@@ -176,72 +705,98 @@ class JenkinsUtils(object):
 
         :param job_name: job name including folder/s, name & branch
         :param build_no: build number.
+        :param finished_only: Only get the data from the stages that have finished
+        :param exclude_stages: List of stage names to leave out
+        :param build_id: Identity of the build (e.g. queue ID). The stage data is
+            only cached when given, as build numbers start over if the job is
+            created again
         """
+        exclude_stages = exclude_stages or []
+        # Stage data of finished builds does not change
+        criteria_data_list = None
+        if build_id is not None:
+            criteria_data_list = await asyncio.to_thread(
+                self.get_cached_stage_data, job_name, build_no, build_id
+            )
+        if criteria_data_list is not None:
+            self.logger.debug(
+                "Using cached stage data for job <%s> (build no: %s)"
+                % (job_name, build_no)
+            )
+            return [
+                stage_data
+                for stage_data in criteria_data_list
+                if stage_data["name"] not in exclude_stages
+            ]
+
         items = list(map("/job/".__add__, job_name.split("/")))
         jenkins_job_name = "".join(items)
 
-        def do_request(path, append=False, json_payload=True):
+        async def do_request(path, append=False):
             if append:
                 target_path = "%s/%s/%s" % (jenkins_job_name, build_no, path)
             else:
                 target_path = path
             self.logger.debug("Request to <%s>" % target_path)
-            requests.packages.urllib3.disable_warnings()
-            r = requests.post(
-                urljoin(self.endpoint, target_path),
-                auth=(self.access_user, self.access_token),
-                verify=False,
-            )
-            if json_payload:
+            session = http_client.get_session()
+            async with session.post(
+                urljoin(self.endpoint, target_path), auth=self.auth, ssl=False
+            ) as r:
                 try:
-                    out = r.json()
+                    out = await r.json(content_type=None)
                 except ValueError:
                     _reason = (
-                        "Could not obtain a JSON response payload from Jenkins path: %s"
-                        % target_path
+                        "Could not obtain a JSON response payload from Jenkins "
+                        "path: %s" % target_path
                     )
                     self.logger.error(_reason)
                     raise SQAaaSAPIException(502, _reason)
-            else:
-                out = r
 
             return out
 
-        def get_text(html_text):
-            soup = BeautifulSoup(html_text, "html.parser")
-            console_tags = soup.find_all("pre", class_="console-output")
-            if len(console_tags) > 1:
-                self.logger.warn(
-                    (
-                        'Detected multiple <pre class="console-output"> tags!'
-                        "Falling back to the first one, ignoring the rest"
-                    )
+        async def get_console_output(path):
+            self.logger.debug("Request to <%s>" % path)
+            parser = ConsoleOutputParser()
+            session = http_client.get_session()
+            async with session.post(
+                urljoin(self.endpoint, path), auth=self.auth, ssl=False
+            ) as r:
+                decoder = codecs.getincrementaldecoder(r.charset or "utf-8")(
+                    errors="replace"
                 )
-            console_output = console_tags[0]
-            return console_output.getText()
-
-        def process_stdout(stdout):
-            stdout = stdout.strip()
-            lines = stdout.split("\n")
-            cmd = lines.pop(0)
-            if not cmd.startswith("+"):
-                self.logger.warn(
-                    (
-                        "Could not identify the command (identified by '+' "
-                        "prefix) in string <%s>. No change done to stdout" % cmd
-                    )
+                async for chunk in r.content.iter_chunked(CONSOLE_CHUNK_SIZE):
+                    parser.feed(decoder.decode(chunk))
+                parser.feed(decoder.decode(b"", final=True))
+            parser.close()
+            if parser.tag_count == 0:
+                _reason = (
+                    'Could not find the <pre class="console-output"> tag in Jenkins '
+                    "path: %s" % path
+                )
+                self.logger.error(_reason)
+                raise SQAaaSAPIException(502, _reason)
+            elif parser.tag_count > 1:
+                self.logger.warning(
+                    'Detected multiple <pre class="console-output"> tags! '
+                    "Falling back to the first one, ignoring the rest"
+                )
+            cmd, output_text = parser.get_output()
+            if not cmd:
+                self.logger.warning(
+                    "Could not identify the command (identified by '+' prefix) in "
+                    "console output from <%s>. No change done to stdout" % path
                 )
-                lines.insert(0, cmd)
-                cmd = ""
-            output_text = "\n".join(lines)
             return (cmd, output_text)
 
-        data = do_request("/wfapi/describe", append=True)
+        data = await do_request("/wfapi/describe", append=True)
+        build_finished = data.get("status", None) in STAGE_VIEW_RESULTS
         stage_name_prefixes = ("QC.", "SvcQC.")
         qc_stages = [
             stage
             for stage in data["stages"]
             if stage["name"].startswith(stage_name_prefixes)
+            and stage["name"] not in exclude_stages
+            and (stage["status"] in STAGE_VIEW_RESULTS or not finished_only)
         ]
         stage_describe_endpoints = [
             stage["_links"]["self"]["href"] for stage in qc_stages
@@ -250,22 +805,22 @@ class JenkinsUtils(object):
             "Found %s stage/s that run quality criteria" % len(stage_describe_endpoints)
         )
 
-        criteria_data_list = []
-        for qa_stage in stage_describe_endpoints:
-            data = do_request(qa_stage)
-            name = data["name"]
-            criterion = name.split()[0]
-            status = data["status"]
-            # Use 'console' endpoint to be subsequently parsed with
-            # beautifulsoup4. Unexpected syntaxes have been seen when using
-            # instead <text> property from 'log' endpoint
-            console_log_endpoint = data["stageFlowNodes"][0]["_links"]["console"][
-                "href"
-            ]
-            console_log_endpoint += "?consoleFull"
-            data = do_request(console_log_endpoint, json_payload=False)
-            stdout = get_text(data.text)
-            cmd, output_text = process_stdout(stdout)
+        semaphore = asyncio.Semaphore(STAGE_DATA_WORKERS)
+
+        async def get_criterion_data(qa_stage):
+            async with semaphore:
+                data = await do_request(qa_stage)
+                name = data["name"]
+                criterion = name.split()[0]
+                status = data["status"]
+                # Use 'console' endpoint to be subsequently parsed (streamed).
+                # Unexpected syntaxes have been seen when using instead <text>
+                # property from 'log' endpoint
+                console_log_endpoint = data["stageFlowNodes"][0]["_links"]["console"][
+                    "href"
+                ]
+                console_log_endpoint += "?consoleFull"
+                cmd, output_text = await get_console_output(console_log_endpoint)
             if not cmd:
                 _reason = (
                     "Could not get the command for the stage: output text "
@@ -275,42 +830,82 @@ class JenkinsUtils(object):
                 )
                 self.logger.error(_reason)
                 raise SQAaaSAPIException(502, _reason)
-            criteria_data_list.append(
-                {
-                    "name": name,
-                    "criterion": criterion,
-                    "status": status,
-                    "stdout_command": cmd,
-                    "stdout_text": output_text,
-                    "url": urljoin(self.endpoint, console_log_endpoint),
-                }
+            return {
+                "name": name,
+                "criterion": criterion,
+                "status": status,
+                "stdout_command": cmd,
+                "stdout_text": output_text,
+                "url": urljoin(self.endpoint, console_log_endpoint),
+            }
+
+        # Results are returned in the same order as the stages
+        criteria_data_list = await asyncio.gather(
+            *[get_criterion_data(qa_stage) for qa_stage in stage_describe_endpoints]
+        )
+
+        criteria_data_list = list(criteria_data_list)
+        if build_finished and not exclude_stages and build_id is not None:
+            await asyncio.to_thread(
+                self.set_cached_stage_data,
+                job_name,
+                build_no,
+                build_id,
+                criteria_data_list,
             )
 
         return criteria_data_list
 
-    def cleanup_stage_failed(self, full_job_name, build_no):
-        _cleanup_failed = False
+    def get_build_status(self, full_job_name, build_no):
+        """Get the result of the build and whether the cleanup stage failed.
+
+        Both are obtained from a single request to the Pipeline Stage View API.
+        Returns None if the status could not be obtained. The result is None
+        while the build is running.
+
+        :param full_job_name: job name including folder/s, name & branch
+        :param build_no: build number.
+        """
         try:
-            stage_list = self.server.get_build_stages(full_job_name, build_no)["stages"]
-        except Exception as e:
+            run_data = self._get_json(
+                "%s/%s" % (self.get_job_path(full_job_name), build_no),
+                api_path="wfapi/describe",
+            )
+        except jenkins.JenkinsException as e:
             self.logger.error(e)
+            self.logger.warning(
+                "Could not get the status for build #%s (job: <%s>)"
+                % (build_no, full_job_name)
+            )
+            return None
+
+        stage_list = run_data.get("stages", [])
+        stage_no = len(stage_list)
+        self.logger.debug(
+            "Number of stages identified for job <%s> "
+            "(build no: %s): %s" % (full_job_name, build_no, stage_no)
+        )
+        # Assume that cleanup stage is the last one
+        _cleanup_failed = False
+        if stage_no > 0:
+            cleanup_stage = stage_list[-1]
+            if cleanup_stage["status"] in ["FAILED"]:
+                _cleanup_failed = True
+
+        return {
+            "result": STAGE_VIEW_RESULTS.get(run_data.get("status")),
+            "cleanup_failed": _cleanup_failed,
+        }
+
+    def cleanup_stage_failed(self, full_job_name, build_no):
+        build_status = self.get_build_status(full_job_name, build_no)
+        if not build_status:
             self.logger.warning(
                 "Could not check if cleanup stage failed for build #%s "
                 "(job: <%s>)" % (build_no, full_job_name)
             )
-        else:
-            stage_no = len(stage_list)
-            self.logger.debug(
-                "Number of stages identified for job <%s> "
-                "(build no: %s): %s" % (full_job_name, build_no, stage_no)
-            )
-            # Assume that cleanup stage is the last one
-            if stage_no > 0:
-                cleanup_stage = stage_list[-1]
-                if cleanup_stage["status"] in ["FAILED"]:
-                    _cleanup_failed = True
-
-        return _cleanup_failed
+            return False
+        return build_status["cleanup_failed"]
 
     def remove_credential(self, credential_id, folder_name, domain_name="_"):
         """Removes a temporary credential in Jenkins.
@@ -331,7 +926,7 @@ class JenkinsUtils(object):
                 "Could not remove credential <%s>: not found" % credential_id
             )
 
-    def create_credential(
+    async def create_credential(
         self,
         credential_id,
         credential_user,
@@ -358,11 +953,12 @@ class JenkinsUtils(object):
             credential_user=credential_user,
             credential_token=credential_token,
         )
-        r = requests.post(
+        session = http_client.get_session()
+        async with session.post(
             urljoin(self.endpoint, CREATE_CREDENTIAL_ORG % locals()),
             data=xml_rendered.encode("utf-8"),
-            auth=(self.access_user, self.access_token),
+            auth=self.auth,
             headers={"Content-Type": "text/xml; charset=utf-8"},
-        )
-        r.raise_for_status()
+        ) as r:
+            r.raise_for_status()
         self.logger.debug("Credential <%s> created" % credential_id)
@@ -173,13 +173,16 @@ class JePLUtils(object):
             tool_criteria_map,
         )
 
-    def get_files(file_type, gh_utils, repo, branch):
-        """Get JePL files of the given type from the remote repository.
+    def get_files(file_type, gh_utils, repo, branch, snapshot=None):
+        """Get the paths of the JePL files of the given type from the remote
+        repository.
 
         :param file_type: Type of JePL file, one of [config, composer, jenkinsfile].
         :param gh_utils: GithubUtils object.
         :param repo: Name of the git repository.
         :param branch: Name of the repository branch.
+        :param snapshot: Tree snapshot of the branch (as returned by
+            GitHubUtils.get_tree_snapshot()), to avoid listing the remote directory.
         """
         prefix_names = {
             "config": "config",
@@ -189,10 +192,24 @@ class JePLUtils(object):
         path = "."
         if file_type in ["config", "composer", "commands_script"]:
             path = ".sqa"
-        file_list = gh_utils.get_repo_content(repo, branch, path)
         prefix = prefix_names[file_type]
+        if snapshot and snapshot["blobs"] is not None:
+            if path == ".":
+                path_list = list(snapshot["blobs"])
+            else:
+                path_list = [
+                    file_path
+                    for file_path in snapshot["blobs"]
+                    if file_path.rsplit("/", 1)[0] == path
+                ]
+            return [
+                file_path
+                for file_path in path_list
+                if file_path.rsplit("/", 1)[-1].startswith(prefix)
+            ]
+        file_list = gh_utils.get_repo_content(repo, branch, path)
         return [
-            file_content
+            file_content.path
             for file_content in file_list
             if file_content.name.startswith(prefix)
         ]
@@ -211,6 +228,9 @@ class JePLUtils(object):
     ):
         """Push the given JePL file structure to the given repo.
 
+        A single snapshot of the branch's tree is used to find out the stale files
+        and the ones that have not changed.
+
         :param cls: Current class (from classmethod)
         :param gh_utils: GitHubUtils object.
         :param repo: Name of the git repository.
@@ -220,7 +240,11 @@ class JePLUtils(object):
         :param commands_script_list: List of generated scripts for the commands builder.
         :param additional_files_to_commit: List of additional files that are needed.
         :param branch: Name of the branch in the remote repository.
+
+        Returns a (<commit ID>, <pushed>) tuple, <pushed> being False if the
+        files were unchanged (no commit done).
         """
+        snapshot = gh_utils.get_tree_snapshot(repo, branch)
         # config
         config_files_to_push = [
             {
@@ -230,10 +254,9 @@ class JePLUtils(object):
             }
             for config_data in config_data_list
         ]
-        config_files_from_repo = [
-            file_content.path
-            for file_content in cls.get_files("config", gh_utils, repo, branch)
-        ]
+        config_files_from_repo = cls.get_files(
+            "config", gh_utils, repo, branch, snapshot=snapshot
+        )
         config_files_to_push_names = [
             file_dict["file_name"] for file_dict in config_files_to_push
         ]
@@ -265,10 +288,9 @@ class JePLUtils(object):
             }
             for commands_script in commands_script_list
         ]
-        commands_scripts_from_repo = [
-            file_content.path
-            for file_content in cls.get_files("commands_script", gh_utils, repo, branch)
-        ]
+        commands_scripts_from_repo = cls.get_files(
+            "commands_script", gh_utils, repo, branch, snapshot=snapshot
+        )
         commands_scripts_to_push_names = [
             file_dict["file_name"] for file_dict in commands_scripts_to_push
         ]
@@ -299,17 +321,18 @@ class JePLUtils(object):
             + commands_scripts_to_remove
             + additional_files_to_push
         )
-        commit = gh_utils.push_files(
+        commit, pushed = gh_utils.push_files(
             files_to_push,
             commit_msg="Add JePL file structure",
             repo_name=repo,
             branch=branch,
+            snapshot=snapshot,
         )
         logger.debug(
             ("GitHub repository <%s> created with the JePL file " "structure" % repo)
         )
 
-        return commit
+        return (commit, pushed)
 
     def get_composer_service(
         name,
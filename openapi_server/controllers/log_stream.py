@@ -0,0 +1,162 @@
+# SPDX-FileCopyrightText: Copyright contributors to the Software Quality Assurance as a Service (SQAaaS) project <sqaaas@ibergrid.eu>
+#
+# SPDX-License-Identifier: GPL-3.0-only
+
+import asyncio
+import json
+import logging
+import re
+
+from openapi_server import config
+
+logger = logging.getLogger("sqaaas.api.log_stream")
+
+# Time (in seconds) between the requests for new log text to Jenkins
+LOG_STREAM_INTERVAL = float(config.get_ci("log_stream_interval", fallback=2))
+# Maximum number of events waiting to be sent to a subscriber. Slower
+# subscribers are disconnected
+LOG_STREAM_QUEUE_SIZE = int(config.get_ci("log_stream_queue_size", fallback=100))
+# Console line that marks the start of a pipeline stage
+STAGE_START_REGEX = re.compile(r"^\[Pipeline\] \{ \((?P<stage>.+)\)$")
+
+# Log streams being fetched, per (job name, build number)
+_streams = {}
+
+
+class BuildLogStream(object):
+    """Fetches incrementally the console log of a Jenkins build (progressive text
+    API) and fans it out to the subscribers.
+
+    Log text is fetched only once, regardless of the number of subscribers, and
+    it is not kept once sent to their (bounded) queues.
+    """
+
+    def __init__(self, jk_utils, job_name, build_no):
+        """BuildLogStream object definition.
+
+        :param jk_utils: JenkinsUtils object
+        :param job_name: job name including folder/s, name & branch
+        :param build_no: build number.
+        """
+        self.jk_utils = jk_utils
+        self.job_name = job_name
+        self.build_no = build_no
+        self.subscribers = set()
+        self.offset = 0
+        self.stage = None
+        self.task = None
+        self._partial_line = ""
+
+    def subscribe(self):
+        """Returns the queue where the events for a new subscriber are put."""
+        # Room is kept for the end-of-stream mark
+        queue = asyncio.Queue(maxsize=LOG_STREAM_QUEUE_SIZE + 1)
+        self.subscribers.add(queue)
+        if self.task is None:
+            self.task = asyncio.create_task(self._run())
+        return queue
+
+    def unsubscribe(self, queue):
+        """Removes the subscriber, stopping the stream if it was the last one.
+
+        :param queue: Queue of the subscriber
+        """
+        self.subscribers.discard(queue)
+        if not self.subscribers and self.task is not None:
+            self.task.cancel()
+            self._unregister()
+
+    def _unregister(self):
+        # A new stream might have been registered meanwhile for the same build
+        key = (self.job_name, self.build_no)
+        if _streams.get(key, None) is self:
+            _streams.pop(key)
+
+    def _publish(self, event):
+        for queue in list(self.subscribers):
+            if queue.qsize() < LOG_STREAM_QUEUE_SIZE:
+                queue.put_nowait(event)
+            else:
+                logger.warning(
+                    "Disconnecting slow subscriber from log stream of job <%s> "
+                    "(build no: %s)" % (self.job_name, self.build_no)
+                )
+                self.subscribers.discard(queue)
+                # Pending events are discarded
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    def _publish_lines(self, lines):
+        stage_lines = []
+        for line in lines:
+            match = STAGE_START_REGEX.match(line)
+            if match:
+                if stage_lines:
+                    self._publish(self._get_log_event(stage_lines))
+                    stage_lines = []
+                self.stage = match.group("stage")
+            stage_lines.append(line)
+        if stage_lines:
+            self._publish(self._get_log_event(stage_lines))
+
+    def _get_log_event(self, lines):
+        return {"event": "log", "stage": self.stage, "text": "\n".join(lines)}
+
+    async def _on_text(self, text):
+        lines = (self._partial_line + text).split("\n")
+        self._partial_line = lines.pop()
+        self._publish_lines(lines)
+
+    async def _run(self):
+        more_data = True
+        try:
+            while more_data:
+                self.offset, more_data = await self.jk_utils.get_progressive_text(
+                    self.job_name, self.build_no, self.offset, self._on_text
+                )
+                if more_data:
+                    await asyncio.sleep(LOG_STREAM_INTERVAL)
+            if self._partial_line:
+                self._publish_lines([self._partial_line])
+            self._publish({"event": "end", "offset": self.offset})
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(
+                "Could not stream the log of job <%s> (build no: %s): %s"
+                % (self.job_name, self.build_no, e)
+            )
+            self._publish({"event": "error", "reason": str(e)})
+        finally:
+            self._unregister()
+            for queue in list(self.subscribers):
+                queue.put_nowait(None)
+            self.subscribers.clear()
+
+
+def subscribe(jk_utils, job_name, build_no):
+    """Subscribes to the log stream of the given build, starting it if needed.
+
+    Returns a (<stream>, <queue>) tuple. Events are put in the queue as
+    dictionaries, and None marks the end of the stream.
+
+    :param jk_utils: JenkinsUtils object
+    :param job_name: job name including folder/s, name & branch
+    :param build_no: build number.
+    """
+    stream = _streams.get((job_name, build_no), None)
+    if stream is None:
+        stream = BuildLogStream(jk_utils, job_name, build_no)
+        _streams[(job_name, build_no)] = stream
+    return (stream, stream.subscribe())
+
+
+def format_event(event):
+    """Returns the given event in server-sent events format.
+
+    :param event: Event dictionary (with 'event' key)
+    """
+    data = dict(event)
+    event_type = data.pop("event")
+    return "event: %s\ndata: %s\n\n" % (event_type, json.dumps(data))
@@ -8,6 +8,7 @@ import functools
 import logging
 import os
 import re
+import time
 import uuid
 from pathlib import Path, PurePath
 
@@ -15,12 +16,17 @@ import anybadge
 import namegenerator
 import yaml
 from aiohttp import web
-from github.GithubException import GithubException, UnknownObjectException
+from github.GithubException import (
+    GithubException,
+    RateLimitExceededException,
+    UnknownObjectException,
+)
 from jenkins import JenkinsException
 from urllib3.util import parse_url
 
 from openapi_server import config
 from openapi_server.controllers import db
+from openapi_server.controllers.cache import TTLCache
 from openapi_server.controllers.git import GitUtils
 from openapi_server.controllers.jepl import JePLUtils
 from openapi_server.exception import SQAaaSAPIException
@@ -36,6 +42,11 @@ docker_credential_org = config.get_ci("docker_credential_org", fallback=None)
 docker_credential_id = config.get_ci("docker_credential_id", fallback=None)
 docker_credential_org = config.get_ci("docker_credential_org", fallback=None)
 
+# IM/EC3 config files with the image ID already set, per repository commit
+im_config_files_cache = TTLCache(
+    maxsize=int(config.get_vcs("im_config_files_cache_size", fallback=128))
+)
+
 
 def upstream_502_response(r):
     _reason = "Unsuccessful request to upstream service API"
@@ -43,6 +54,68 @@ def upstream_502_response(r):
     return web.json_response(r, status=502, reason=_reason, text=_reason)
 
 
+def upstream_503_response(r, retry_after):
+    _reason = "Upstream service API rate limit exceeded"
+    logger.error(_reason)
+    return web.json_response(
+        r,
+        status=503,
+        reason=_reason,
+        text=_reason,
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+def get_retry_after(headers):
+    """Returns the seconds to wait before retrying, from the headers of a
+    rate-limited response.
+
+    :param headers: Dict with the response headers
+    """
+    headers = {k.lower(): v for k, v in (headers or {}).items()}
+    retry_after = 60
+    if "retry-after" in headers:
+        retry_after = int(headers["retry-after"])
+    elif "x-ratelimit-reset" in headers:
+        retry_after = max(int(headers["x-ratelimit-reset"]) - int(time.time()), 1)
+    return retry_after
+
+
+def get_rate_limit_quota(headers):
+    """Returns the status of the rate limit (remaining & total requests, reset
+    time) from the headers of a rate-limited response.
+
+    :param headers: Dict with the response headers
+    """
+    headers = {k.lower(): v for k, v in (headers or {}).items()}
+    quota = {}
+    for key in ["limit", "remaining", "reset"]:
+        value = headers.get("x-ratelimit-%s" % key, None)
+        if value is not None and str(value).isdigit():
+            quota[key] = int(value)
+    return quota
+
+
+def _get_github_exception_reason(exc, default=None):
+    """Returns the error message from a GithubException.
+
+    :param exc: GithubException object
+    :param default: Message to use when the exception carries none
+    """
+    data = exc.data
+    if isinstance(data, dict):
+        if data.get("errors", None):
+            _error = data["errors"][0]
+            if isinstance(_error, dict):
+                return _error.get("message", default or str(_error))
+            return str(_error)
+        if data.get("message", None):
+            return data["message"]
+    elif data:
+        return str(data)
+    return default or str(exc)
+
+
 def debug_request(f):
     @functools.wraps(f)
     async def decorated_function(*args, **kwargs):
@@ -160,12 +233,19 @@ def validate_request(f):
             logger.error("(GitHub) %s (exit code: %s)" % (_reason, _status))
             r = {"upstream_status": _status, "upstream_reason": _reason}
             return upstream_502_response(r)
+        except RateLimitExceededException as e:
+            _status = e.status
+            _reason = _get_github_exception_reason(e, "Rate limit exceeded")
+            logger.error("(GitHub) %s (exit code: %s)" % (_reason, _status))
+            r = {
+                "upstream_status": _status,
+                "upstream_reason": _reason,
+                "upstream_quota": get_rate_limit_quota(e.headers),
+            }
+            return upstream_503_response(r, get_retry_after(e.headers))
         except GithubException as e:
             _status = e.status
-            if "errors" in list(e.data):
-                _reason = e.data["errors"][0]["message"]
-            else:
-                _reason = e.data["message"]
+            _reason = _get_github_exception_reason(e)
             logger.error("(GitHub) %s (exit code: %s)" % (_reason, _status))
             r = {"upstream_status": _status, "upstream_reason": _reason}
             return upstream_502_response(r)
@@ -1204,12 +1284,13 @@ def format_filtered_data(valid, reason_list, subcriteria=None):
     return {"valid": False, "filtered_reason": reason_list, "subcriteria": subcriteria}
 
 
-@GitUtils.do_git_work
-def add_image_to_im(
-    im_config_file, image_id, openstack_url, tech, repo, path=".", **kwargs
-):
+def add_image_to_im(im_config_file, image_id, openstack_url, tech, repo):
     """Adds image_id (defined in sqaaas.ini) to TOSCA and RADL files used by IM.
 
+    Only the given file is fetched from the remote repository. The resultant file is
+    cached per repository commit, so it is not fetched again while the branch does not
+    change.
+
     Returns a dict with the same format (<file_name> and <file_data> keys) as the JePL
     files.
 
@@ -1218,7 +1299,6 @@ def add_image_to_im(
     :param openstack_url: URL of the OpenStack endpoint
     :param tech: type of technology used, either 'im_client' or 'ec3_client'
     :param repo: repository object (URL & branch)
-    :param path: look for file extensions in the given repo path
     """
 
     def _add_image_id_to_radl(data, image_id):
@@ -1262,21 +1342,37 @@ def add_image_to_im(
                 node["capabilities"]["os"]["properties"]["image"] = image_id
         return str(data)
 
+    repo_url = repo["repo"]
+    repo_creds = repo.get("credential_data", {})
+    repo_branch = repo.get("branch", None)
+    if not repo_branch:
+        repo_branch = GitUtils.get_default_branch_from_remote(repo_url, repo_creds)
+    commit_id = GitUtils.get_commit_from_remote(
+        GitUtils._format_git_url(repo_url, repo_creds=repo_creds), repo_branch
+    )
+    cache_key = (repo_url, commit_id, im_config_file, image_id, openstack_url, tech)
+    data = im_config_files_cache.get(cache_key)
+    if data:
+        logger.debug(
+            "Using cached IM config file <%s> (repo: %s, commit: %s)"
+            % (im_config_file, repo_url, commit_id)
+        )
+        return {"file_name": im_config_file, "file_data": data}
+
     openstack_host = get_host_from_uri(openstack_url)
     ost_image_id = "ost://%s/%s" % (openstack_host, image_id)
-    data = None
     _reason = None
-    im_config_file_abspath = Path(path) / im_config_file
-    if Path(im_config_file_abspath).exists():
-        with open(Path(im_config_file_abspath), "r") as f:
-            if im_config_file.endswith(".radl"):
-                data = f.read()
-                data = _add_image_id_to_radl(data, ost_image_id)
-            elif im_config_file.endswith((".yml", ".yaml")):
-                data = yaml.full_load(f)
-                data = _add_image_id_to_tosca(data, ost_image_id)
-            else:
-                _reason = "IM config file type not supported: %s" % im_config_file
+    commit_id, file_data = GitUtils.get_file_from_remote(
+        repo_url, im_config_file, branch=repo_branch, repo_creds=repo_creds
+    )
+    if file_data is not None:
+        if im_config_file.endswith(".radl"):
+            data = _add_image_id_to_radl(file_data, ost_image_id)
+        elif im_config_file.endswith((".yml", ".yaml")):
+            data = yaml.full_load(file_data)
+            data = _add_image_id_to_tosca(data, ost_image_id)
+        else:
+            _reason = "IM config file type not supported: %s" % im_config_file
     else:
         _reason = "IM config file <%s> does not exist!" % im_config_file
 
@@ -1289,6 +1385,9 @@ def add_image_to_im(
         logger.error(_reason)
         raise SQAaaSAPIException(422, _reason)
 
+    cache_key = (repo_url, commit_id, im_config_file, image_id, openstack_url, tech)
+    im_config_files_cache.set(cache_key, data)
+
     return {"file_name": im_config_file, "file_data": data}
 
 
@@ -1322,9 +1421,12 @@ def get_credential_data(credential_id, pipeline_data):
     return credential_data, credential_tmp
 
 
+@functools.lru_cache(maxsize=64)
 def get_status_badge(status, digital_object_type):
     """Generates a badge with the given information.
 
+    Badges are cached, since they are only a function of the given arguments.
+
     :param status: One of the valid status of the assessment.
     :param digital_object_type: Type of assessment
     """
@@ -20,7 +20,7 @@ VERSION = "3.2.1"
 REQUIRES = [
     "connexion==2.14.2",
     "swagger-ui-bundle==0.0.9",
-    "PyGithub>=1.53",
+    "PyGithub>=2.10.0",
     "python-jenkins>=1.7.0",
     "deepdiff>=5.2.3",
     "GitPython>=3.1.17",
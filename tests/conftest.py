@@ -38,3 +38,14 @@ def client(monkeypatch, loop, aiohttp_client, mock_github_utils, mock_jenkins_ut
     )
     app.add_api("openapi.yaml", pythonic_params=True, pass_context_arg_name="request")
     return loop.run_until_complete(aiohttp_client(app.app))
+
+
+@pytest.fixture
+def default_controller(monkeypatch, mock_github_utils, mock_jenkins_utils):
+    def mock_init_utils():
+        return (None, mock_github_utils, mock_jenkins_utils, None)
+
+    monkeypatch.setattr("openapi_server.controllers.init_utils", mock_init_utils)
+    from openapi_server.controllers import default_controller
+
+    return default_controller
@@ -0,0 +1,57 @@
+# SPDX-FileCopyrightText: Copyright contributors to the Software Quality Assurance as a Service (SQAaaS) project <sqaaas@ibergrid.eu>
+#
+# SPDX-License-Identifier: GPL-3.0-only
+
+import asyncio
+
+import pytest
+
+pipeline_id = "dd7d8481-81a3-407f-95f0-a2f1cb382a4b"
+pipeline_data = {
+    "pipeline_repo": "org/repo_name",
+    "pipeline_repo_branch": "main",
+    "qaa": {"digital_object_type": "software"},
+}
+
+
+@pytest.fixture
+def pushed_badges(mocker, default_controller):
+    pushed = []
+
+    class MockGitHubUtils:
+        @staticmethod
+        def push_file(**kwargs):
+            pushed.append(kwargs["file_data"])
+            return "commit_id"
+
+    mocker.patch.object(default_controller, "gh_utils", MockGitHubUtils())
+    mocker.patch.object(default_controller, "STATUS_BADGE_PUSH_DELAY", 0.05)
+    mocker.patch.object(
+        default_controller.ctls_utils,
+        "get_status_badge",
+        lambda status, digital_object_type: status,
+    )
+    yield pushed
+    default_controller._pending_badges.clear()
+
+
+async def test_badge_updates_coalesced(default_controller, pushed_badges):
+    """Only the latest status within the time window is pushed."""
+    default_controller._schedule_badge_push(pipeline_id, pipeline_data, "building")
+    default_controller._schedule_badge_push(pipeline_id, pipeline_data, "gold")
+    task = default_controller._pending_badges[pipeline_id]["task"]
+    await task
+    assert pushed_badges == ["gold"]
+    assert pipeline_id not in default_controller._pending_badges
+
+
+async def test_badge_popped_into_another_push(default_controller, pushed_badges):
+    """A badge included in another push is not pushed on its own."""
+    default_controller._schedule_badge_push(pipeline_id, pipeline_data, "building")
+    task = default_controller._pending_badges[pipeline_id]["task"]
+    badge_file = default_controller._pop_pending_badge(pipeline_id)
+    assert badge_file["file_data"] == "building"
+    assert default_controller._pop_pending_badge(pipeline_id) is None
+    await asyncio.sleep(0.1)
+    assert task.cancelled()
+    assert pushed_badges == []
@@ -0,0 +1,97 @@
+# SPDX-FileCopyrightText: Copyright contributors to the Software Quality Assurance as a Service (SQAaaS) project <sqaaas@ibergrid.eu>
+#
+# SPDX-License-Identifier: GPL-3.0-only
+
+import pytest
+from openapi_server.controllers.jenkins import JenkinsUtils
+
+pipeline_id = "dd7d8481-81a3-407f-95f0-a2f1cb382a4b"
+
+
+class MockJenkinsUtils(JenkinsUtils):
+    def __init__(self):
+        self.builds = {}
+        self.requests = 0
+
+    def get_folder_builds(self, folder_name):
+        self.requests += 1
+        return self.builds
+
+    def cleanup_stage_failed(self, *args, **kwargs):
+        return False
+
+
+@pytest.fixture
+def poller(mocker, default_controller):
+    jenkins_index = {
+        pipeline_id: {
+            "jenkins": {
+                "job_name": "org/repo/main",
+                "scan_org_wait": False,
+                "build_info": {
+                    "number": None,
+                    "item_number": 11,
+                    "url": None,
+                    "status": "QUEUED",
+                },
+            },
+            "qaa": False,
+        }
+    }
+
+    def update_build_info(_pipeline_id, build_data, scan_org_wait=None):
+        jenkins_index[_pipeline_id]["jenkins"]["build_info"].update(build_data)
+
+    async def handle_badge_status(*args, **kwargs):
+        return []
+
+    jk_utils = MockJenkinsUtils()
+    mocker.patch.object(default_controller, "jk_utils", jk_utils)
+    mocker.patch.object(
+        default_controller.db, "get_jenkins_index", lambda: dict(jenkins_index)
+    )
+    mocker.patch.object(default_controller.db, "update_build_info", update_build_info)
+    mocker.patch.object(default_controller.db, "get_entry", return_value={})
+    mocker.patch.object(default_controller, "_handle_badge_status", handle_badge_status)
+    yield jk_utils, jenkins_index[pipeline_id]["jenkins"]["build_info"]
+    default_controller._polled_builds.clear()
+
+
+async def test_poll_builds_status_changes(default_controller, poller):
+    """The stored build data follows the build, until it completes."""
+    jk_utils, build_info = poller
+    await default_controller._poll_builds()
+    assert build_info["status"] == "QUEUED"
+    assert pipeline_id in default_controller._polled_builds
+
+    build = {"number": 5, "url": "https://jenkins/5", "result": None, "queueId": 11}
+    jk_utils.builds = {("org", "repo", "main"): [build]}
+    default_controller._polled_builds[pipeline_id]["next"] = 0
+    await default_controller._poll_builds()
+    assert (build_info["number"], build_info["status"]) == (5, "EXECUTING")
+
+    build["result"] = "SUCCESS"
+    default_controller._polled_builds[pipeline_id]["next"] = 0
+    await default_controller._poll_builds()
+    assert build_info["status"] == "SUCCESS"
+
+    # Completed builds are no longer tracked
+    requests = jk_utils.requests
+    await default_controller._poll_builds()
+    assert pipeline_id not in default_controller._polled_builds
+    assert jk_utils.requests == requests
+
+
+async def test_poll_builds_not_found(mocker, default_controller, poller):
+    """Builds that never show up are set as NOT_BUILT after the timeout."""
+    jk_utils, build_info = poller
+    mocker.patch.object(default_controller, "BUILD_POLLER_TIMEOUT", 600)
+    await default_controller._poll_builds()
+    assert build_info["status"] == "QUEUED"
+
+    schedule = default_controller._polled_builds[pipeline_id]
+    schedule["since"] -= 601
+    schedule["next"] = 0
+    await default_controller._poll_builds()
+    assert build_info["status"] == "NOT_BUILT"
+    assert pipeline_id not in default_controller._polled_builds
@@ -0,0 +1,83 @@
+# SPDX-FileCopyrightText: Copyright contributors to the Software Quality Assurance as a Service (SQAaaS) project <sqaaas@ibergrid.eu>
+#
+# SPDX-License-Identifier: GPL-3.0-only
+
+import logging
+
+import pytest
+from openapi_server.controllers.jenkins import JenkinsUtils
+
+jenkins_index = {
+    "finished": {
+        "jenkins": {
+            "job_name": "org/repo/main",
+            "build_info": {
+                "number": 3,
+                "item_number": 10,
+                "commit_id": "aaa",
+                "status": "SUCCESS",
+            },
+        },
+        "qaa": False,
+    },
+    "queued": {
+        "jenkins": {
+            "job_name": "Org/Repo/main",
+            "build_info": {
+                "number": None,
+                "item_number": 11,
+                "commit_id": "bbb",
+                "status": "QUEUED",
+            },
+        },
+        "qaa": False,
+    },
+    "other_job": {
+        "jenkins": {
+            "job_name": "org/other/main",
+            "build_info": {
+                "number": 4,
+                "item_number": 12,
+                "commit_id": "ccc",
+                "status": "EXECUTING",
+            },
+        },
+        "qaa": False,
+    },
+}
+expected_pipeline_id = [
+    ("org/repo/main", {"number": 3}, "finished"),
+    ("org/repo/main", {"number": 4, "queue_id": 11}, "queued"),
+    ("org/repo/main", {"scm": {"commit": "bbb"}}, "queued"),
+    ("org/repo/main", {"number": 7}, "queued"),
+    ("org/other/main", {"number": 3}, None),
+    ("org/unknown/main", {"number": 3}, None),
+]
+
+
+@pytest.mark.parametrize("jk_job_name,build,expected", expected_pipeline_id)
+def test_get_pipeline_id_by_build(
+    mocker, default_controller, jk_job_name, build, expected
+):
+    """The notified build is routed to the pipeline that owns it."""
+    mocker.patch.object(default_controller, "jk_utils", JenkinsUtils)
+    mocker.patch.object(
+        default_controller.db, "get_jenkins_index", return_value=jenkins_index
+    )
+    pipeline_id = default_controller._get_pipeline_id_by_build(jk_job_name, build)
+    assert pipeline_id == expected
+
+
+@pytest.mark.parametrize("token", ["wrong-token", "ñ", ""])
+async def test_add_jenkins_notification_invalid_token(
+    mocker, caplog, default_controller, token
+):
+    """Invalid tokens are answered with 403, without logging them."""
+    mocker.patch.object(default_controller, "JENKINS_NOTIFICATION_TOKEN", "secret")
+    caplog.set_level(logging.DEBUG)
+    response = await default_controller.add_jenkins_notification(
+        None, body={"build": {}}, token=token
+    )
+    assert response.status == 403
+    if token:
+        assert token not in caplog.text
@@ -0,0 +1,73 @@
+# SPDX-FileCopyrightText: Copyright contributors to the Software Quality Assurance as a Service (SQAaaS) project <sqaaas@ibergrid.eu>
+#
+# SPDX-License-Identifier: GPL-3.0-only
+
+import json
+
+import pytest
+
+pipeline_id = "dd7d8481-81a3-407f-95f0-a2f1cb382a4b"
+pipeline_data = {"qaa": {"criteria_filtered": {}}}
+stage_data_list = [{"name": "QC.Sty"}, {"name": "QC.Uni"}]
+
+
+@pytest.fixture
+def validated_stages(mocker, tmp_path, default_controller):
+    db_file = tmp_path / "sqaaas.json"
+    db_file.write_text(json.dumps({pipeline_id: {}}), encoding="utf-8")
+    mocker.patch.object(default_controller.db, "DB_FILE", db_file)
+
+    validated = []
+
+    async def validate_stage_output(stage_data, pipeline_data):
+        validated.append(stage_data["name"])
+        return {"criterion": stage_data["name"], "output": {}, "broken": None}
+
+    async def get_stage_data(job_name, build_no, finished_only=False, **kwargs):
+        return [
+            stage_data
+            for stage_data in stage_data_list[:1]
+            if stage_data["name"] not in kwargs.get("exclude_stages", [])
+        ]
+
+    mocker.patch.object(
+        default_controller, "_validate_stage_output", validate_stage_output
+    )
+    mocker.patch.object(
+        default_controller.jk_utils, "get_stage_data", get_stage_data, create=True
+    )
+    yield validated
+    default_controller._validated_stages.clear()
+
+
+async def test_stage_validation_reused(default_controller, validated_stages):
+    """Stages validated while the build runs are not validated again."""
+    await default_controller._validate_finished_stages(
+        pipeline_id, "org/repo/main", 5, 11
+    )
+    assert validated_stages == ["QC.Sty"]
+    await default_controller._validate_finished_stages(
+        pipeline_id, "org/repo/main", 5, 11
+    )
+    assert validated_stages == ["QC.Sty"]
+
+    output_data, _ = await default_controller._validate_output(
+        stage_data_list, pipeline_data, pipeline_id=pipeline_id, build_no=5, build_id=11
+    )
+    assert validated_stages == ["QC.Sty", "QC.Uni"]
+    assert set(output_data) == {"QC.Sty", "QC.Uni"}
+
+
+async def test_stage_validation_other_build(default_controller, validated_stages):
+    """Validations are not reused by a build with the same number but another
+    identity, nor once a new build is started."""
+    await default_controller._validate_finished_stages(
+        pipeline_id, "org/repo/main", 5, 11
+    )
+    await default_controller._validate_output(
+        stage_data_list, pipeline_data, pipeline_id=pipeline_id, build_no=5, build_id=12
+    )
+    assert validated_stages == ["QC.Sty", "QC.Sty", "QC.Uni"]
+
+    default_controller.db.clear_stage_validation(pipeline_id)
+    assert default_controller.db.get_stage_validation(pipeline_id, 5, 12) == {}
@@ -16,7 +16,11 @@ class MockJenkinsUtils:
         return False
 
     @staticmethod
-    def scan_organization(*args, **kwargs):
+    async def scan_organization(*args, **kwargs):
+        return True
+
+    @staticmethod
+    async def wait_for_job(*args, **kwargs):
         return True
 
 
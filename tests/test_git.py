@@ -0,0 +1,116 @@
+# SPDX-FileCopyrightText: Copyright contributors to the Software Quality Assurance as a Service (SQAaaS) project <sqaaas@ibergrid.eu>
+#
+# SPDX-License-Identifier: GPL-3.0-only
+
+import os
+import time
+
+import pytest
+from git import Actor, Repo
+from git.exc import GitCommandError
+from openapi_server.controllers import git as git_module
+from openapi_server.controllers.git import GitUtils
+from openapi_server.exception import SQAaaSAPIException
+
+author = Actor("sqaaas", "sqaaas@example.org")
+
+
+def commit_file(repo_path, file_name, content):
+    repo = Repo(repo_path)
+    with open(os.path.join(repo_path, file_name), "w") as f:
+        f.write(content)
+    repo.index.add([file_name])
+    commit = repo.index.commit("Add %s" % file_name, author=author, committer=author)
+    repo.remotes.origin.push("HEAD:refs/heads/main")
+    return commit.hexsha
+
+
+def get_head(repo_path):
+    return Repo(repo_path).git.rev_parse("refs/heads/main")
+
+
+@pytest.fixture
+def repos(monkeypatch, tmp_path):
+    monkeypatch.setattr(git_module, "MIRROR_FOLDER", str(tmp_path / "mirrors"))
+    os.makedirs(tmp_path / "mirrors")
+    # Local paths have no host to add the credentials to
+    monkeypatch.setattr(
+        GitUtils, "_format_git_url", lambda repo_url, **kwargs: repo_url
+    )
+    source = str(tmp_path / "source.git")
+    target = str(tmp_path / "target.git")
+    Repo.init(source, bare=True, initial_branch="main")
+    Repo.init(target, bare=True, initial_branch="main")
+    source_work = Repo.clone_from(source, tmp_path / "source").working_dir
+    target_work = str(tmp_path / "target")
+    return source, target, source_work, target_work
+
+
+def test_clone_and_push_skips_unchanged_source(repos):
+    source, target, source_work, target_work = repos
+    git_utils = GitUtils("token")
+    source_commit_id = commit_file(source_work, "README.md", "v1")
+
+    assert git_utils.clone_and_push(source, target, "main") == "main"
+    assert get_head(target) == source_commit_id
+
+    # JePL files are committed on top of the source commit
+    Repo.clone_from(target, target_work)
+    jepl_commit_id = commit_file(target_work, ".sqa", "config")
+    git_utils.clone_and_push(source, target, "main")
+    assert get_head(target) == jepl_commit_id
+
+    # New source commits replace the target's branch
+    new_source_commit_id = commit_file(source_work, "README.md", "v2")
+    git_utils.clone_and_push(source, target, "main")
+    assert get_head(target) == new_source_commit_id
+
+
+def test_clone_and_push_pushes_when_target_diverges(repos):
+    source, target, source_work, target_work = repos
+    git_utils = GitUtils("token")
+    source_commit_id = commit_file(source_work, "README.md", "v1")
+    git_utils.clone_and_push(source, target, "main")
+
+    # Target's branch no longer contains the source commit
+    target_repo = Repo.init(target_work, initial_branch="main")
+    target_repo.create_remote("origin", target)
+    commit_file(target_work, "other.md", "other")
+    target_repo.remotes.origin.push("+HEAD:refs/heads/main")
+    git_utils.clone_and_push(source, target, "main")
+    assert get_head(target) == source_commit_id
+
+
+def test_prune_mirrors(repos):
+    source, target, source_work, _ = repos
+    commit_file(source_work, "README.md", "v1")
+    GitUtils("token").clone_and_push(source, target, "main")
+    (mirror_path,) = [
+        entry.path for entry in os.scandir(git_module.MIRROR_FOLDER) if entry.is_dir()
+    ]
+    assert GitUtils.prune_mirrors() == 0
+    old = time.time() - 31 * 86400
+    os.utime(mirror_path, (old, old))
+    assert GitUtils.prune_mirrors() == 1
+    assert not os.path.exists(mirror_path)
+
+
+def test_get_file_from_remote_hides_credentials(monkeypatch):
+    monkeypatch.setattr(
+        GitUtils, "_format_git_creds", lambda repo_creds: "user:secret@"
+    )
+
+    def clone_from(url, *args, **kwargs):
+        raise GitCommandError(["git", "clone"], 128, "fatal: could not read %s" % url)
+
+    monkeypatch.setattr(git_module.Repo, "clone_from", clone_from)
+    with pytest.raises(SQAaaSAPIException) as exc_info:
+        GitUtils.get_file_from_remote(
+            "https://example.org/org/repo",
+            "config.radl",
+            branch="main",
+            repo_creds={"user_id": "user", "token": "secret"},
+        )
+    assert exc_info.value.http_code == 422
+    assert "secret" not in exc_info.value.message
+    assert "https://example.org/org/repo" in exc_info.value.message
@@ -0,0 +1,56 @@
+# SPDX-FileCopyrightText: Copyright contributors to the Software Quality Assurance as a Service (SQAaaS) project <sqaaas@ibergrid.eu>
+#
+# SPDX-License-Identifier: GPL-3.0-only
+
+import asyncio
+
+from openapi_server.controllers import log_stream
+
+
+class MockJenkinsUtils:
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.offsets = []
+
+    async def get_progressive_text(self, job_name, build_no, start, callback):
+        self.offsets.append(start)
+        await asyncio.sleep(0)
+        text = self.chunks.pop(0)
+        await callback(text)
+        return (start + len(text), bool(self.chunks))
+
+
+async def test_log_stream_fan_out(monkeypatch):
+    """Log text is fetched once and sent to every subscriber."""
+    monkeypatch.setattr(log_stream, "LOG_STREAM_INTERVAL", 0)
+    jk_utils = MockJenkinsUtils(["[Pipeline] { (QC.Sty)\n+ fla", "ke8\nend\n"])
+    stream, queue_1 = log_stream.subscribe(jk_utils, "org/repo/main", 1)
+    _stream, queue_2 = log_stream.subscribe(jk_utils, "org/repo/main", 1)
+    assert stream is _stream
+    for queue in [queue_1, queue_2]:
+        events = []
+        while (event := await queue.get()) is not None:
+            events.append(event)
+        assert events == [
+            {"event": "log", "stage": "QC.Sty", "text": "[Pipeline] { (QC.Sty)"},
+            {"event": "log", "stage": "QC.Sty", "text": "+ flake8\nend"},
+            {"event": "end", "offset": 35},
+        ]
+    assert jk_utils.offsets == [0, 27]
+    assert ("org/repo/main", 1) not in log_stream._streams
+
+
+async def test_log_stream_resubscribed_while_stopping():
+    """A cancelled stream does not unregister the one that replaces it."""
+    jk_utils = MockJenkinsUtils(["text\n"] * 10)
+    stream, queue = log_stream.subscribe(jk_utils, "org/repo/main", 2)
+    await asyncio.sleep(0)
+    stream.unsubscribe(queue)
+    new_stream, new_queue = log_stream.subscribe(jk_utils, "org/repo/main", 2)
+    assert new_stream is not stream
+    # Cancelled task finishes after the new stream is registered
+    await asyncio.gather(stream.task, return_exceptions=True)
+    assert log_stream._streams[("org/repo/main", 2)] is new_stream
+    new_stream.unsubscribe(new_queue)
+    await asyncio.gather(new_stream.task, return_exceptions=True)
+    assert ("org/repo/main", 2) not in log_stream._streams
@@ -4,7 +4,10 @@
 # SPDX-License-Identifier: GPL-3.0-only
 
 import pytest
-from openapi_server.controllers import utils
+from github.GithubException import RateLimitExceededException
+from openapi_server.controllers import cache, utils
+from openapi_server.controllers.github import GitHubUtils
+from openapi_server.controllers.jenkins import ConsoleOutputParser, JenkinsUtils
 
 supported_git_platform = {"github": "https://github.com"}
 expected_git_platform = [
@@ -122,3 +125,166 @@ expected_registry_url = [
 def test_get_registry_from_image(image_name, expected):
     registry_url = utils.get_registry_from_image(image_name)
     assert registry_url == expected
+
+
+expected_retry_after = [
+    ({"Retry-After": "30"}, 30),
+    ({"retry-after": "5", "x-ratelimit-reset": "0"}, 5),
+    ({"X-RateLimit-Reset": "0"}, 1),
+    ({}, 60),
+    (None, 60),
+]
+
+
+@pytest.mark.parametrize("headers,expected", expected_retry_after)
+def test_get_retry_after(headers, expected):
+    retry_after = utils.get_retry_after(headers)
+    assert retry_after == expected
+
+
+console_output_html = (
+    "<html><body><pre>header</pre>"
+    '<pre class="console-output">+ flake8 --format=json &amp; echo &lt;done&gt;\n'
+    '{"a.py": []}\n<span>line 2</span>\n</pre>'
+    '<pre class="console-output">other</pre></body></html>'
+)
+expected_console_output = [
+    (
+        console_output_html,
+        "+ flake8 --format=json & echo <done>",
+        '{"a.py": []}\nline 2',
+        2,
+    ),
+    (
+        '<pre class="console-output">  + true  </pre>',
+        "+ true",
+        "",
+        1,
+    ),
+    (
+        '<pre class="console-output">Started by user\n<pre>x</pre>\nend</pre>',
+        "",
+        "Started by user\nx\nend",
+        1,
+    ),
+    ("<html><pre>no console</pre></html>", "", "", 0),
+]
+
+
+@pytest.mark.parametrize(
+    "html,expected_cmd,expected_output,expected_tag_count", expected_console_output
+)
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_console_output_parser(
+    html, expected_cmd, expected_output, expected_tag_count, chunk_size
+):
+    parser = ConsoleOutputParser()
+    for i in range(0, len(html), chunk_size):
+        parser.feed(html[i : i + chunk_size])
+    parser.close()
+    assert parser.get_output() == (expected_cmd, expected_output)
+    assert parser.tag_count == expected_tag_count
+
+
+expected_blob_sha = [
+    ("", "e69de29bb2d1d6434b8b29ae775ad8c2e48c5391"),
+    ("hello\n", "ce013625030ba8dba906f756967f9e9ca394464a"),
+    ("ñ\n", "35e695e8342dd9a68c7776bbf7cab6592f02b256"),
+    (b"\x00\xff", "ba01f6b05bdbb386b35f4d086e268c5d422cafb9"),
+]
+
+
+@pytest.mark.parametrize("file_data,expected", expected_blob_sha)
+def test_get_blob_sha(file_data, expected):
+    assert GitHubUtils.get_blob_sha(file_data) == expected
+
+
+expected_job_name_from_path = [
+    (
+        "https://jenkins.example.org/job/org/job/My.Repo/job/feature%252Fx/12/",
+        "org/My.Repo/feature%2Fx",
+    ),
+    ("/job/org/job/repo/job/main", "org/repo/main"),
+    ("job/org/job/repo/job/main/", "org/repo/main"),
+]
+
+
+@pytest.mark.parametrize("job_path,expected", expected_job_name_from_path)
+def test_get_job_name_from_path(job_path, expected):
+    assert JenkinsUtils.get_job_name_from_path(job_path) == expected
+
+
+expected_normalized_job_name = [
+    ("Org/My.Repo/main", ["org", "my.repo", "main"]),
+    ("org/repo/feature%2Fx", ["org", "repo", "feature/x"]),
+    ("org/repo/feature%252Fx", ["org", "repo", "feature/x"]),
+    ("org/repo/Feature%25252FX", ["org", "repo", "feature/x"]),
+]
+
+
+@pytest.mark.parametrize("job_name,expected", expected_normalized_job_name)
+def test_normalize_job_name(job_name, expected):
+    assert JenkinsUtils.normalize_job_name(job_name) == expected
+
+
+def test_normalize_job_name_round_trip():
+    job_name = "org/My.Repo/feature%2Fx"
+    job_path = JenkinsUtils.get_job_path(job_name)
+    assert JenkinsUtils.normalize_job_name(
+        JenkinsUtils.get_job_name_from_path(job_path)
+    ) == JenkinsUtils.normalize_job_name(job_name)
+
+
+def test_ttl_cache_lru_eviction():
+    lru_cache = cache.TTLCache(maxsize=2)
+    lru_cache.set("a", 1)
+    lru_cache.set("b", 2)
+    assert lru_cache.get("a") == 1  # 'b' becomes the least recently used
+    lru_cache.set("c", 3)
+    assert "b" not in lru_cache
+    assert lru_cache.get("a") == 1
+    assert lru_cache.get("c") == 3
+
+
+def test_ttl_cache_expiration(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    ttl_cache = cache.TTLCache(ttl=10)
+    ttl_cache.set("a", 1)
+    ttl_cache.set("b", 2, ttl=30)
+    ttl_cache.set("c", 3, ttl=0)
+    now[0] += 5
+    assert ttl_cache.get("a") == 1
+    assert ttl_cache.get("c") is None
+    now[0] += 10
+    assert ttl_cache.get("a", default="expired") == "expired"
+    assert ttl_cache.get("b") == 2
+    assert ttl_cache.pop("b") == 2
+    assert ttl_cache.pop("b", default="missing") == "missing"
+
+
+expected_write_quota = [
+    ((-1, -1), False),
+    ((5000, 5000), False),
+    ((100, 5000), False),
+    ((99, 5000), True),
+]
+
+
+@pytest.mark.parametrize("rate_limiting,expected_refused", expected_write_quota)
+def test_check_write_quota(rate_limiting, expected_refused):
+    gh_utils = GitHubUtils("token")
+    requester = gh_utils.client.requester
+    requester.rate_limiting = rate_limiting
+    requester.rate_limiting_resettime = 1700000000
+    if not expected_refused:
+        gh_utils.check_write_quota()
+        return
+    with pytest.raises(RateLimitExceededException) as exc_info:
+        gh_utils.push_file("README.md", "data", "Add README", "org/repo")
+    headers = exc_info.value.headers
+    assert utils.get_rate_limit_quota(headers) == {
+        "limit": 5000,
+        "remaining": 99,
+        "reset": 1700000000,
+    }